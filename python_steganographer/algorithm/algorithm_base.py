@@ -1,32 +1,53 @@
 """Classes for steganography algorithms."""
 
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 from numpy.typing import NDArray
 
+CHANNEL_EXECUTOR = ThreadPoolExecutor(max_workers=3, thread_name_prefix="steganography-channel")
+
 
 class AlgorithmBase(ABC):
     """Abstract base class for steganography algorithms."""
 
-    @abstractmethod
-    def embed_data(self, channel: NDArray[np.uint8], data: str) -> NDArray[np.uint8]:
-        """Embed data into image channel.
+    def embed_data(self, channel: NDArray[np.uint8], data: str | bytes) -> NDArray[np.uint8]:
+        """Embed data into a copy of an image channel.
 
         :param NDArray[np.uint8] channel: Image channel to embed data into
-        :param str data: Data to embed
+        :param str | bytes data: ASCII data to embed
         :return NDArray[np.uint8]: Modified channel with embedded data
         """
-        # Check capacity
-        max_capacity = self.calculate_capacity(channel.shape)
+        modified_channel = channel.copy()
+        self.embed_data_in_place(modified_channel, data)
+        return modified_channel
+
+    @abstractmethod
+    def embed_data_in_place(self, channel: NDArray[np.uint8], data: str | bytes) -> None:
+        """Embed data into image channel, modifying it in place.
+
+        The channel may be a strided view of an image array, e.g. `image[:, :, 0]`.
+
+        :param NDArray[np.uint8] channel: Image channel to embed data into
+        :param str | bytes data: ASCII data to embed
+        """
+        self.check_capacity(channel.shape, data)
+
+    def check_capacity(self, channel_shape: tuple[int, ...], data: str | bytes) -> None:
+        """Check that data fits in an image channel.
+
+        :param tuple[int, ...] channel_shape: Shape of the image channel
+        :param str | bytes data: ASCII data to embed
+        :raises ValueError: If the data is larger than the channel capacity
+        """
+        max_capacity = self.calculate_capacity(channel_shape)
         if len(data) > max_capacity:
             msg = (
                 f"Message too large for image. Message length: {len(data)}, Maximum capacity: {max_capacity} characters"
             )
             raise ValueError(msg)
 
-        return channel
-
     @abstractmethod
     def extract_data(self, channel: NDArray[np.uint8]) -> str:
         """Extract data from image channel.
@@ -44,3 +65,35 @@ class AlgorithmBase(ABC):
         :return int: Maximum number of characters that can be embedded
         """
         pass
+
+    def embed_channels(self, image: NDArray[np.uint8], data: list[str | bytes]) -> NDArray[np.uint8]:
+        """Embed data into the channels of a copy of an image.
+
+        :param NDArray[np.uint8] image: Image array of shape (height, width, channels)
+        :param list[str | bytes] data: ASCII data to embed, one item per channel starting from channel 0
+        :return NDArray[np.uint8]: Modified image with embedded data
+        """
+        modified_image = image.copy()
+        self.embed_channels_in_place(modified_image, data)
+        return modified_image
+
+    def embed_channels_in_place(self, image: NDArray[np.uint8], data: list[str | bytes]) -> None:
+        """Embed data into the channels of an image, modifying it in place.
+
+        Each channel is processed on a separate thread; the NumPy and SciPy kernels release the GIL.
+
+        :param NDArray[np.uint8] image: Image array of shape (height, width, channels)
+        :param list[str | bytes] data: ASCII data to embed, one item per channel starting from channel 0
+        """
+        channels = [image[:, :, channel] for channel in range(len(data))]
+        list(CHANNEL_EXECUTOR.map(self.embed_data_in_place, channels, data))
+
+    def extract_channels(self, image: NDArray[np.uint8], num_channels: int) -> list[str]:
+        """Extract data from the channels of an image in parallel.
+
+        :param NDArray[np.uint8] image: Image array of shape (height, width, channels)
+        :param int num_channels: Number of channels to extract data from, starting from channel 0
+        :return list[str]: Extracted data, one item per channel
+        """
+        channels = [image[:, :, channel] for channel in range(num_channels)]
+        return list(CHANNEL_EXECUTOR.map(self.extract_data, channels))
@@ -2,11 +2,11 @@
 
 import numpy as np
 from numpy.typing import NDArray
-from scipy.fft import dct, idct
+from scipy.fft import idctn
 
 from python_steganographer.algorithm import AlgorithmBase
-from python_steganographer.constants import NUM_BITS
-from python_steganographer.helpers import bytes_list_to_msg, msg_to_bytes_list
+from python_steganographer.constants import DCT_TILE_BLOCKS, EXTRACT_CHUNK_CHARS, NUM_BITS
+from python_steganographer.helpers import bit_chunks_to_msg, msg_to_ascii, msg_to_bytes_list
 
 
 class DCTAlgorithm(AlgorithmBase):
@@ -44,46 +44,42 @@ class DCTAlgorithm(AlgorithmBase):
         self.block_size = block_size
         self.dct_coefficient = dct_coefficient
         self.quantization_factor = quantization_factor
+        self._coeff_row, self._coeff_col = DCTAlgorithm.get_dct_coefficient_position(dct_coefficient, block_size)
+        self._basis = DCTAlgorithm.get_dct_basis(self._coeff_row, self._coeff_col, block_size)
 
-    def embed_data(self, channel: NDArray[np.uint8], data: str) -> NDArray[np.uint8]:
-        """Embed data into image channel using DCT steganography.
+    def embed_data_in_place(self, channel: NDArray[np.uint8], data: str | bytes) -> None:
+        """Embed data into image channel using DCT steganography, modifying it in place.
 
         :param NDArray[np.uint8] channel: Image channel to embed data into
-        :param str data: Data to embed
-        :return NDArray[np.uint8]: Modified channel with embedded data
+        :param str | bytes data: ASCII data to embed
         """
-        super().embed_data(channel, data)
+        super().embed_data_in_place(channel, data)
 
         # Convert message to bits and add termination marker
-        msg_bits = msg_to_bytes_list(data + "\0")  # Add null terminator
+        msg_bits = msg_to_bytes_list(msg_to_ascii(data) + b"\0")  # Add null terminator
 
-        # Split image into blocks
-        blocks = DCTAlgorithm.split_into_blocks(channel, self.block_size)
+        # Work through a view of the channel's blocks, so blocks without message bits are left untouched
+        block_grid = DCTAlgorithm.get_block_view(channel, self.block_size)
+        num_bits = min(len(msg_bits), block_grid.shape[0] * block_grid.shape[1])
 
-        # Process each block
-        modified_blocks = []
-        for i, block in enumerate(blocks):
-            # Apply DCT
-            dct_block = DCTAlgorithm.apply_dct_2d(block)
+        # Process the blocks carrying message bits one cache-sized tile at a time
+        for start in range(0, num_bits, DCT_TILE_BLOCKS):
+            stop = min(start + DCT_TILE_BLOCKS, num_bits)
+            modified_blocks = DCTAlgorithm.gather_blocks(block_grid, start, stop)
 
-            # Embed bit if we have more bits to embed
-            if i < len(msg_bits):
-                coeff_pos = DCTAlgorithm.get_dct_coefficient_position(self.dct_coefficient, self.block_size)
-                coeff_row, coeff_col = coeff_pos
+            # Embed one bit per block in the specified coefficient
+            dct_coeffs = DCTAlgorithm.project_onto_basis(modified_blocks, self._basis)
+            modified_coeffs = DCTAlgorithm.embed_bits_in_dct_coefficients(
+                dct_coeffs, msg_bits[start:stop], self.quantization_factor
+            )
 
-                # Embed bit in the specified coefficient
-                original_coeff = dct_block[coeff_row, coeff_col]
-                modified_coeff = DCTAlgorithm.embed_bit_in_dct_coefficient(
-                    original_coeff, msg_bits[i], self.quantization_factor
-                )
-                dct_block[coeff_row, coeff_col] = modified_coeff
+            # Only one coefficient changes, so the inverse DCT reduces to adding the change along its basis function
+            modified_coeffs -= dct_coeffs
+            modified_blocks += modified_coeffs[:, np.newaxis, np.newaxis] * self._basis
 
-            # Apply inverse DCT
-            reconstructed_block = DCTAlgorithm.apply_idct_2d(dct_block)
-            modified_blocks.append(reconstructed_block)
-
-        # Reconstruct the image
-        return DCTAlgorithm.reconstruct_from_blocks(modified_blocks, channel.shape, self.block_size)
+            # Clip to the valid range, and write the blocks back (the uint8 conversion truncates)
+            np.clip(modified_blocks, 0, 255, out=modified_blocks)
+            block_grid[DCTAlgorithm.get_block_positions(start, stop, block_grid.shape[1])] = modified_blocks
 
     def extract_data(self, channel: NDArray[np.uint8]) -> str:
         """Extract data from image channel using DCT steganography.
@@ -91,25 +87,24 @@ class DCTAlgorithm(AlgorithmBase):
         :param NDArray[np.uint8] channel: Image channel to extract data from
         :return str: Extracted data
         """
-        # Split image into blocks
-        blocks = DCTAlgorithm.split_into_blocks(channel, self.block_size)
-
-        # Extract bits from each block
-        extracted_bits = []
-        for block in blocks:
-            # Apply DCT
-            dct_block = DCTAlgorithm.apply_dct_2d(block)
-
-            # Extract bit from the specified coefficient
-            coeff_pos = DCTAlgorithm.get_dct_coefficient_position(self.dct_coefficient, self.block_size)
-            coeff_row, coeff_col = coeff_pos
-            coeff_value = dct_block[coeff_row, coeff_col]
-
-            bit = DCTAlgorithm.extract_bit_from_dct_coefficient(coeff_value, self.quantization_factor)
-            extracted_bits.append(bit)
-
-        # Convert bits back to message
-        return bytes_list_to_msg(extracted_bits)
+        # View the image as blocks
+        block_grid = DCTAlgorithm.get_block_view(channel, self.block_size)
+        num_blocks = block_grid.shape[0] * block_grid.shape[1]
+        chunk_size = EXTRACT_CHUNK_CHARS * NUM_BITS
+
+        # Gather blocks a chunk at a time and extract a bit from the specified coefficient of each block
+        extracted_bits = (
+            DCTAlgorithm.extract_bits_from_dct_coefficients(
+                DCTAlgorithm.project_onto_basis(
+                    DCTAlgorithm.gather_blocks(block_grid, start, min(start + chunk_size, num_blocks)), self._basis
+                ),
+                self.quantization_factor,
+            )
+            for start in range(0, num_blocks, chunk_size)
+        )
+
+        # Convert bits back to message, stopping once the null terminator is found
+        return bit_chunks_to_msg(extracted_bits)
 
     def calculate_capacity(self, channel_shape: tuple[int, ...]) -> int:
         """Calculate data capacity for this channel using DCT.
@@ -165,104 +160,116 @@ class DCTAlgorithm(AlgorithmBase):
         return (row, col)
 
     @staticmethod
-    def apply_dct_2d(block: NDArray[np.float64]) -> NDArray[np.float64]:
-        """Apply 2D DCT to an image block.
+    def apply_idct_2d(dct_block: NDArray[np.floating]) -> NDArray[np.floating]:
+        """Apply 2D inverse DCT to DCT coefficients of a block or a stack of blocks.
 
-        :param NDArray[np.float64] block: 8x8 image block to transform
-        :return NDArray[np.float64]: DCT coefficients
+        :param NDArray[np.floating] dct_block: DCT coefficients to transform back
+        :return NDArray[np.floating]: Reconstructed image block, in the same precision as the input
         """
-        return dct(dct(block.T, norm="ortho").T, norm="ortho")  # type: ignore[no-any-return]
+        return idctn(dct_block, axes=(-2, -1), norm="ortho", workers=-1)  # type: ignore[no-any-return]
 
     @staticmethod
-    def apply_idct_2d(dct_block: NDArray[np.float64]) -> NDArray[np.float64]:
-        """Apply 2D inverse DCT to DCT coefficients.
+    def get_dct_basis(coeff_row: int, coeff_col: int, block_size: int) -> NDArray[np.float32]:
+        """Get the 2D DCT basis function of a single coefficient.
+
+        With orthonormal scaling, the coefficient of a block is its dot product with this basis function, and changing
+        the coefficient by `d` changes the block by `d` times the basis function.
 
-        :param NDArray[np.float64] dct_block: DCT coefficients to transform back
-        :return NDArray[np.float64]: Reconstructed image block
+        :param int coeff_row: Row of the coefficient in the block
+        :param int coeff_col: Column of the coefficient in the block
+        :param int block_size: Size of blocks (typically 8x8)
+        :return NDArray[np.float32]: Basis function with shape (block_size, block_size)
         """
-        return idct(idct(dct_block.T, norm="ortho").T, norm="ortho")  # type: ignore[no-any-return]
+        impulse = np.zeros((block_size, block_size), dtype=np.float64)
+        impulse[coeff_row, coeff_col] = 1.0
+        return DCTAlgorithm.apply_idct_2d(impulse).astype(np.float32)
 
     @staticmethod
-    def split_into_blocks(channel: NDArray[np.uint8], block_size: int) -> list[NDArray[np.float64]]:
-        """Split image channel into blocks for DCT processing.
+    def project_onto_basis(blocks: NDArray[np.floating], basis: NDArray[np.floating]) -> NDArray[np.floating]:
+        """Calculate a single DCT coefficient for a stack of blocks without transforming the whole blocks.
 
-        :param NDArray[np.uint8] channel: Image channel to split
-        :param int block_size: Size of blocks (typically 8x8)
-        :return list[NDArray[np.float64]]: List of image blocks as float arrays
+        :param NDArray[np.floating] blocks: Stack of image blocks with shape (num_blocks, block_size, block_size)
+        :param NDArray[np.floating] basis: Basis function of the coefficient from `get_dct_basis`
+        :return NDArray[np.floating]: DCT coefficient of each block
         """
-        h = channel.shape[0]
-        w = channel.shape[1]
-        blocks = []
+        return blocks.reshape(len(blocks), -1) @ basis.reshape(-1)
 
-        # Process image in block_size x block_size blocks
-        for i in range(0, h - h % block_size, block_size):
-            for j in range(0, w - w % block_size, block_size):
-                block = channel[i : i + block_size, j : j + block_size].astype(np.float64)
-                blocks.append(block)
+    @staticmethod
+    def get_block_view(channel: NDArray[np.uint8], block_size: int) -> NDArray[np.uint8]:
+        """Get a view of the complete blocks in an image channel.
 
-        return blocks
+        Writing to the view modifies the channel. Pixels beyond the last complete block row/column are not included.
+
+        :param NDArray[np.uint8] channel: Image channel to view
+        :param int block_size: Size of blocks (typically 8x8)
+        :return NDArray[np.uint8]: View with shape (num_blocks_h, num_blocks_w, block_size, block_size)
+        """
+        num_blocks_h = channel.shape[0] // block_size
+        num_blocks_w = channel.shape[1] // block_size
+
+        # Group pixels into block_size x block_size blocks
+        trimmed = channel[: num_blocks_h * block_size, : num_blocks_w * block_size]
+        return trimmed.reshape(num_blocks_h, block_size, num_blocks_w, block_size).swapaxes(1, 2)
 
     @staticmethod
-    def reconstruct_from_blocks(
-        blocks: list[NDArray[np.float64]], original_shape: tuple[int, int], block_size: int
-    ) -> NDArray[np.uint8]:
-        """Reconstruct image channel from processed blocks.
-
-        :param list[NDArray[np.float64]] blocks: List of processed image blocks
-        :param tuple[int, int] original_shape: Original shape of the image channel
-        :param int block_size: Size of blocks used
-        :return NDArray[np.uint8]: Reconstructed image channel
+    def get_block_positions(start: int, stop: int, num_blocks_w: int) -> tuple[NDArray[np.int64], NDArray[np.int64]]:
+        """Get the (row, col) grid positions of a range of blocks in row-major block order.
+
+        :param int start: Index of the first block
+        :param int stop: Index after the last block
+        :param int num_blocks_w: Number of blocks in each row of the grid
+        :return tuple[NDArray[np.int64], NDArray[np.int64]]: Block rows and columns
         """
-        h, w = original_shape
-        reconstructed = np.zeros((h, w), dtype=np.float64)
-        block_idx = 0
+        return np.divmod(np.arange(start, stop), num_blocks_w)
+
+    @staticmethod
+    def gather_blocks(block_grid: NDArray[np.uint8], start: int, stop: int) -> NDArray[np.float32]:
+        """Copy a range of blocks from a block view into a contiguous stack for DCT processing.
 
-        # Reconstruct image from blocks
-        for i in range(0, h - h % block_size, block_size):
-            for j in range(0, w - w % block_size, block_size):
-                if block_idx < len(blocks):
-                    reconstructed[i : i + block_size, j : j + block_size] = blocks[block_idx]
-                    block_idx += 1
+        Single precision is ample for 8-bit pixels and halves the memory traffic of the transforms.
 
-        # Clip values to valid range and convert back to uint8
-        reconstructed = np.clip(reconstructed, 0, 255)
-        return reconstructed.astype(np.uint8)
+        :param NDArray[np.uint8] block_grid: Block view from `get_block_view`
+        :param int start: Index of the first block
+        :param int stop: Index after the last block
+        :return NDArray[np.float32]: Stack of image blocks with shape (stop - start, block_size, block_size)
+        """
+        rows, cols = DCTAlgorithm.get_block_positions(start, stop, block_grid.shape[1])
+        return block_grid[rows, cols].astype(np.float32)
 
     @staticmethod
-    def embed_bit_in_dct_coefficient(dct_coeff: float, bit: int, quantization: int) -> float:
-        """Embed a bit in a DCT coefficient using quantization.
+    def embed_bits_in_dct_coefficients(
+        dct_coeffs: NDArray[np.floating], bits: NDArray[np.uint8], quantization: int
+    ) -> NDArray[np.floating]:
+        """Embed bits in an array of DCT coefficients using quantization.
+
+        Each coefficient is quantized by rounding half to even, and the parity of the quantized value is set to the
+        corresponding bit with a mask instead of branching (even for 0, odd for 1).
 
-        :param float dct_coeff: Original DCT coefficient
-        :param int bit: Bit to embed (0 or 1)
+        :param NDArray[np.floating] dct_coeffs: Original DCT coefficients
+        :param NDArray[np.uint8] bits: Bits to embed (0 or 1), one per coefficient
         :param int quantization: Quantization factor
-        :return float: Modified DCT coefficient
+        :return NDArray[np.floating]: Modified DCT coefficients, in the same precision as the input
         """
-        # Quantize the coefficient
-        quantized = round(dct_coeff / quantization)
-
-        # Embed bit by making coefficient even (bit=0) or odd (bit=1)
-        if bit == 0:
-            # Make even
-            if quantized % 2 == 1:
-                quantized -= 1
-        elif bit == 1:
-            # Make odd
-            if quantized % 2 == 0:
-                quantized += 1
-
-        # Scale back
-        return quantized * quantization
+        # Multiply by the reciprocal rather than dividing every coefficient, and round in place
+        modified_coeffs = dct_coeffs * dct_coeffs.dtype.type(1.0 / quantization)
+        np.rint(modified_coeffs, out=modified_coeffs)
+
+        # Quantized pixel-block coefficients fit comfortably in 32-bit integers
+        quantized = modified_coeffs.astype(np.int32)
+        np.bitwise_and(quantized, np.int32(~1), out=quantized)
+        np.bitwise_or(quantized, bits, out=quantized)
+
+        np.multiply(quantized, dct_coeffs.dtype.type(quantization), out=modified_coeffs)
+        return modified_coeffs
 
     @staticmethod
-    def extract_bit_from_dct_coefficient(dct_coeff: float, quantization: int) -> int:
-        """Extract a bit from a DCT coefficient.
+    def extract_bits_from_dct_coefficients(dct_coeffs: NDArray[np.floating], quantization: int) -> NDArray[np.uint8]:
+        """Extract bits from an array of DCT coefficients.
 
-        :param float dct_coeff: DCT coefficient to extract bit from
+        :param NDArray[np.floating] dct_coeffs: DCT coefficients to extract bits from
         :param int quantization: Quantization factor used during embedding
-        :return int: Extracted bit (0 or 1)
+        :return NDArray[np.uint8]: Extracted bits (0 or 1), one per coefficient
         """
-        # Quantize the coefficient
-        quantized = round(dct_coeff / quantization)
-
-        # Extract bit from parity (even=0, odd=1)
-        return quantized % 2
+        quantized = dct_coeffs * dct_coeffs.dtype.type(1.0 / quantization)
+        np.rint(quantized, out=quantized)
+        return (quantized.astype(np.int32) & 1).astype(np.uint8)
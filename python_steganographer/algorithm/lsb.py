@@ -1,11 +1,13 @@
 """Classes for steganography algorithms."""
 
+from math import prod
+
 import numpy as np
 from numpy.typing import NDArray
 
 from python_steganographer.algorithm import AlgorithmBase
-from python_steganographer.constants import NUM_BITS
-from python_steganographer.helpers import bytes_list_to_msg, msg_to_bytes_list
+from python_steganographer.constants import EXTRACT_CHUNK_CHARS, NUM_BITS
+from python_steganographer.helpers import bit_chunks_to_msg, msg_to_ascii, msg_to_bytes_list
 
 
 class LSBAlgorithm(AlgorithmBase):
@@ -16,24 +18,56 @@ class LSBAlgorithm(AlgorithmBase):
     statistical analysis.
     """
 
-    def embed_data(self, channel: NDArray[np.uint8], data: str) -> NDArray[np.uint8]:
-        """Embed data into image channel using LSB steganography.
+    def embed_data_in_place(self, channel: NDArray[np.uint8], data: str | bytes) -> None:
+        """Embed data into image channel using LSB steganography, modifying it in place.
 
         :param NDArray[np.uint8] channel: Image channel to embed data into
-        :param str data: Data to embed
-        :return NDArray[np.uint8]: Modified channel with embedded data
+        :param str | bytes data: ASCII data to embed
         """
-        super().embed_data(channel, data)
+        super().embed_data_in_place(channel, data)
 
-        # Flatten the channel for processing
-        original_shape = channel.shape
-        flattened = channel.flatten()
+        # Only the leading pixels that carry the message are read and written back; the flat iterator does this for
+        # strided channel views without copying the whole channel
+        msg_pixels = channel.flat[: (len(data) + 1) * NUM_BITS]
 
         # Insert message using LSB
-        modified_flattened = self.insert_msg(flattened, data)
+        self.insert_msg(msg_pixels, data)
+        channel.flat[: len(msg_pixels)] = msg_pixels
+
+    def embed_channels_in_place(self, image: NDArray[np.uint8], data: list[str | bytes]) -> None:
+        """Embed data into the channels of an image using LSB steganography, modifying it in place.
 
-        # Reshape back to original dimensions
-        return modified_flattened.reshape(original_shape)
+        The messages for all channels are written in a single pass over the leading pixels of the image, rather than
+        one pass per channel. The layout in each channel is the same as with `embed_data_in_place`.
+
+        :param NDArray[np.uint8] image: Image array of shape (height, width, channels)
+        :param list[str | bytes] data: ASCII data to embed, one item per channel starting from channel 0
+        """
+        # Reshaping only gives a view of contiguous images
+        if not image.flags.c_contiguous:
+            super().embed_channels_in_place(image, data)
+            return
+
+        channel_shape = image.shape[:2]
+        for channel_data in data:
+            self.check_capacity(channel_shape, channel_data)
+
+        # Convert each message and null terminator to bits, keeping as much of the terminator as fits
+        num_pixels = channel_shape[0] * channel_shape[1]
+        msg_bits = [msg_to_bytes_list(msg_to_ascii(channel_data) + b"\0")[:num_pixels] for channel_data in data]
+        num_msg_pixels = max((len(bits) for bits in msg_bits), default=0)
+
+        # Lay the bits out as (pixel, channel), with masks that only clear the LSBs of pixels carrying message bits
+        bits = np.zeros((num_msg_pixels, len(data)), dtype=np.uint8)
+        lsb_masks = np.full((num_msg_pixels, len(data)), 0xFF, dtype=np.uint8)
+        for channel, channel_bits in enumerate(msg_bits):
+            bits[: len(channel_bits), channel] = channel_bits
+            lsb_masks[: len(channel_bits), channel] = 0xFE
+
+        # Overwrite the LSBs of the leading pixels of every channel in place
+        pixels = image.reshape(num_pixels, image.shape[2])[:num_msg_pixels, : len(data)]
+        np.bitwise_and(pixels, lsb_masks, out=pixels)
+        np.bitwise_or(pixels, bits, out=pixels)
 
     def extract_data(self, channel: NDArray[np.uint8]) -> str:
         """Extract data from image channel using LSB steganography.
@@ -41,8 +75,9 @@ class LSBAlgorithm(AlgorithmBase):
         :param NDArray[np.uint8] channel: Image channel to extract data from
         :return str: Extracted data
         """
-        # Flatten the channel for processing
-        flattened = channel.flatten()
+        # Iterate over the channel in flat order; unlike ravel() this does not copy strided channel views in full,
+        # so only the pixels up to the null terminator are read
+        flattened = channel.flat
 
         # Extract message using LSB
         return self.extract_msg(flattened)
@@ -53,8 +88,7 @@ class LSBAlgorithm(AlgorithmBase):
         :param tuple[int, ...] channel_shape: Shape of the image channel
         :return int: Maximum number of characters that can be embedded
         """
-        total_pixels = np.prod(channel_shape)
-        return int(total_pixels // NUM_BITS)
+        return prod(channel_shape) // NUM_BITS
 
     @staticmethod
     def even_img(img: NDArray[np.uint8]) -> NDArray[np.uint8]:
@@ -66,50 +100,60 @@ class LSBAlgorithm(AlgorithmBase):
         :param NDArray[np.uint8] img: Array of pixel values
         :return NDArray[np.uint8]: Array of even pixel values with same shape as `img`
         """
-        # Cast to int to perform operations, then back to uint8
-        img_int = img.astype(np.int32)
-        return np.array(img_int - (img_int % 2), dtype=np.uint8)
+        # Clear the LSB of every pixel
+        return np.bitwise_and(img, np.uint8(0xFE))
 
     @staticmethod
-    def insert_msg(flattened_img: NDArray[np.uint8], msg: str) -> NDArray[np.uint8]:
+    def insert_msg(flattened_img: NDArray[np.uint8], msg: str | bytes) -> NDArray[np.uint8]:
         """Insert a message into image using LSB steganography.
 
         This function modifies the least significant bit of each pixel to store
-        message bits. The image must be flattened first.
+        message bits, followed by a null terminator if there is room for one.
+        Pixels after the terminator are left untouched. The image must be
+        flattened first, and is modified in place.
 
         :param NDArray[np.uint8] flattened_img: Flattened image array
-        :param str msg: Message to insert into image
-        :return NDArray[np.uint8]: Flattened image array with message embedded in LSB
+        :param str | bytes msg: ASCII message to insert into image
+        :return NDArray[np.uint8]: The same flattened image array with message embedded in LSB
         """
-        # Make all pixel values even (LSB = 0)
-        flattened_img = LSBAlgorithm.even_img(flattened_img)
-
-        # Convert message to bits
-        msg_bytes = np.array(msg_to_bytes_list(msg), dtype=np.uint8)
+        # Convert message and null terminator to bits
+        msg_bytes = msg_to_bytes_list(msg_to_ascii(msg) + b"\0")
 
         # Check if message fits
-        if len(msg_bytes) > len(flattened_img):
-            msg = f"Message too large for image. Need {len(msg_bytes)} pixels, have {len(flattened_img)}"
+        msg_length = len(msg_bytes) - NUM_BITS
+        if msg_length > len(flattened_img):
+            msg = f"Message too large for image. Need {msg_length} pixels, have {len(flattened_img)}"
             raise ValueError(msg)
 
-        # Add message bits to LSB of pixels
-        flattened_img[: len(msg_bytes)] += msg_bytes
+        # Keep as much of the null terminator as fits
+        msg_bytes = msg_bytes[: len(flattened_img)]
+
+        # Overwrite the LSBs of the leading pixels in place
+        pixels = flattened_img[: len(msg_bytes)]
+        np.bitwise_and(pixels, np.uint8(0xFE), out=pixels)
+        np.bitwise_or(pixels, msg_bytes, out=pixels)
 
         return flattened_img
 
     @staticmethod
-    def extract_msg(flattened_img: NDArray[np.uint8]) -> str:
+    def extract_msg(flattened_img: NDArray[np.uint8] | np.flatiter) -> str:
         """Extract a message from an image using LSB steganography.
 
         This function reads the least significant bit of each pixel to reconstruct
-        the hidden message.
+        the hidden message. Pixels are read in chunks so that extraction stops
+        soon after the null terminator instead of scanning the whole image.
 
-        :param NDArray[np.uint8] flattened_img: Flattened image array with embedded message
+        :param NDArray[np.uint8] | np.flatiter flattened_img: Flattened image array (or flat
+            iterator over an image array) with embedded message
         :return str: Extracted message from image LSBs
         """
-        # Extract LSBs (remainder when divided by 2)
-        msg_bytes_array: NDArray[np.uint8] = flattened_img % 2
-        msg_bytes = msg_bytes_array.tolist()
+        chunk_size = EXTRACT_CHUNK_CHARS * NUM_BITS
+
+        # Extract LSBs
+        msg_bits = (
+            np.bitwise_and(flattened_img[start : start + chunk_size], np.uint8(1))
+            for start in range(0, len(flattened_img), chunk_size)
+        )
 
         # Convert bits back to message
-        return bytes_list_to_msg(msg_bytes)
+        return bit_chunks_to_msg(msg_bits)
@@ -1,7 +1,13 @@
 """Constants for the steganographer server."""
 
-import numpy as np
-
 MAX_BITS_PER_PIXEL = 8
 NUM_BITS = MAX_BITS_PER_PIXEL - 1
-BIT_MAP = np.array([2 ** (NUM_BITS - 1 - i) for i in range(NUM_BITS)])
+EXTRACT_CHUNK_CHARS = 1024
+DCT_TILE_BLOCKS = 1024
+PNG_COMPRESS_LEVEL = 1
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+PNG_HEADER_SIZE = 26
+PNG_COLOR_TYPE_CHANNELS = {0: 1, 2: 3, 4: 2, 6: 4}
+RSA_KEY_POOL_SIZE = 4
+LEGACY_AES_CFB_IV_SIZE = 16
+AES_GCM_DATA_MARKER = b"SGCM"
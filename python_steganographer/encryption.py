@@ -3,6 +3,9 @@
 from __future__ import annotations
 
 import os
+import queue
+import threading
+from contextlib import suppress
 
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.decrepit.ciphers import modes
@@ -10,6 +13,9 @@ from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.asymmetric import padding, rsa
 from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateKey, RSAPublicKey
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+from python_steganographer.constants import AES_GCM_DATA_MARKER, LEGACY_AES_CFB_IV_SIZE, RSA_KEY_POOL_SIZE
 
 
 class EncryptionHandler:
@@ -37,15 +43,56 @@ class EncryptionHandler:
             msg = "Either provide the keys or their sizes to generate new keys."
             raise ValueError(msg)
 
-        self.private_key = private_key or rsa.generate_private_key(
-            public_exponent=65537,
-            key_size=private_key_size,  # ty:ignore[invalid-argument-type]
-            backend=default_backend(),
-        )
-        self.public_key = self.private_key.public_key()
+        self._private_key_size = private_key_size
+        self._private_key = private_key
+        self._public_key: RSAPublicKey | None = None
         self.iv = iv or os.urandom(iv_size)  # ty:ignore[invalid-argument-type]
         self.aes_key = aes_key or os.urandom(aes_key_size)  # ty:ignore[invalid-argument-type]
 
+    @classmethod
+    def generate(cls, private_key_size: int, iv_size: int, aes_key_size: int) -> EncryptionHandler:
+        """Create an EncryptionHandler with a freshly generated RSA key, IV and AES key.
+
+        :param int private_key_size: Size of the RSA private key
+        :param int iv_size: Size of the initialization vector
+        :param int aes_key_size: Size of the AES key
+        :return EncryptionHandler: Instance of EncryptionHandler with newly generated keys
+        """
+        return cls(
+            private_key=cls.generate_private_key(private_key_size),
+            iv=os.urandom(iv_size),
+            aes_key=os.urandom(aes_key_size),
+        )
+
+    @property
+    def private_key(self) -> RSAPrivateKey:
+        """RSA private key, generated on first access if one was not provided.
+
+        :return RSAPrivateKey: RSA private key
+        """
+        if self._private_key is None:
+            self._private_key = self.generate_private_key(self._private_key_size)  # ty:ignore[invalid-argument-type]
+        return self._private_key
+
+    @property
+    def public_key(self) -> RSAPublicKey:
+        """RSA public key derived from the private key.
+
+        :return RSAPublicKey: RSA public key
+        """
+        if self._public_key is None:
+            self._public_key = self.private_key.public_key()
+        return self._public_key
+
+    @staticmethod
+    def generate_private_key(private_key_size: int) -> RSAPrivateKey:
+        """Generate a new RSA private key.
+
+        :param int private_key_size: Size of the RSA private key
+        :return RSAPrivateKey: Newly generated RSA private key
+        """
+        return rsa.generate_private_key(public_exponent=65537, key_size=private_key_size, backend=default_backend())
+
     @staticmethod
     def private_key_to_str(private_key: RSAPrivateKey) -> str:
         """Convert RSAPrivateKey to a PEM formatted string.
@@ -97,21 +144,32 @@ class EncryptionHandler:
 
     @staticmethod
     def encrypt_with_aes(aes_key: bytes, iv: bytes, msg: bytes) -> bytes:
-        """Encrypt a message using AES encryption in CFB mode.
+        """Encrypt a message using AES encryption in GCM mode.
 
         :param bytes aes_key: AES key for encryption
         :param bytes iv: Initialization vector for encryption
         :param bytes msg: Message to encrypt
-        :return bytes: Encrypted message
+        :return bytes: Encrypted message followed by the GCM authentication tag
         """
-        cipher = Cipher(algorithms.AES(aes_key), modes.CFB(iv), backend=default_backend())
-        encryptor = cipher.encryptor()
-        return encryptor.update(msg) + encryptor.finalize()
+        return AESGCM(aes_key).encrypt(iv, msg, None)
 
     @staticmethod
     def decrypt_with_aes(aes_key: bytes, iv: bytes, encrypted_msg: bytes) -> str:
+        """Decrypt a message using AES decryption in GCM mode.
+
+        :param bytes aes_key: AES key for decryption
+        :param bytes iv: Initialization vector for decryption
+        :param bytes encrypted_msg: Encrypted message followed by the GCM authentication tag
+        :return str: Decrypted message
+        """
+        return AESGCM(aes_key).decrypt(iv, encrypted_msg, None).decode("utf-8")
+
+    @staticmethod
+    def decrypt_with_aes_cfb(aes_key: bytes, iv: bytes, encrypted_msg: bytes) -> str:
         """Decrypt a message using AES decryption in CFB mode.
 
+        Images encoded before the switch to AES-GCM hold their message encrypted in this mode.
+
         :param bytes aes_key: AES key for decryption
         :param bytes iv: Initialization vector for decryption
         :param bytes encrypted_msg: Encrypted message to decrypt
@@ -150,12 +208,15 @@ class EncryptionHandler:
     def encrypt(self, msg: str) -> tuple[bytes, bytes]:
         """Encrypt a message using AES encryption and RSA public key encryption.
 
+        The encrypted data starts with a marker so that decryption can tell it apart from AES-CFB data written before
+        the switch to AES-GCM.
+
         :param str msg: Message to encrypt
         :return tuple[bytes, bytes]: Encrypted data and encrypted AES key
         """
         encrypted_msg = self.encrypt_with_aes(self.aes_key, self.iv, bytes(msg, "utf-8"))
         encrypted_aes_key = self.encrypt_with_rsa(self.public_key, self.aes_key)
-        encrypted_data = self.iv + encrypted_msg
+        encrypted_data = AES_GCM_DATA_MARKER + self.iv + encrypted_msg
         return encrypted_data, encrypted_aes_key
 
     @classmethod
@@ -166,19 +227,122 @@ class EncryptionHandler:
 
         :param RSAPrivateKey private_key: RSA private key for decrypting the AES key
         :param bytes encrypted_aes_key: Encrypted AES key for decryption
-        :param int iv_size: Size of the AES initialization vector in bytes
+        :param int iv_size: Size of the AES-GCM initialization vector in bytes
         :param bytes msg: Encrypted message containing the IV and encrypted data
         :return EncryptionHandler: Instance of EncryptionHandler with decrypted AES key and IV
         """
-        extracted_iv = msg[:iv_size]
+        if msg.startswith(AES_GCM_DATA_MARKER):
+            extracted_iv = msg[len(AES_GCM_DATA_MARKER) : len(AES_GCM_DATA_MARKER) + iv_size]
+        else:
+            extracted_iv = msg[:LEGACY_AES_CFB_IV_SIZE]
         decrypted_aes_key = cls.decrypt_with_rsa(private_key, encrypted_aes_key)
         return cls(private_key=private_key, iv=extracted_iv, aes_key=decrypted_aes_key)
 
     def decrypt(self, msg: bytes) -> str:
         """Decrypt a message using AES decryption and RSA private key decryption.
 
+        Messages without the AES-GCM marker were encoded before the switch to AES-GCM, and are decrypted as AES-CFB
+        behind a 16 byte IV.
+
         :param bytes msg: Encrypted message containing the IV and encrypted data
         :return str: Decrypted message
         """
-        extracted_encrypted_msg = msg[16:]
+        if not msg.startswith(AES_GCM_DATA_MARKER):
+            return EncryptionHandler.decrypt_with_aes_cfb(
+                self.aes_key, msg[:LEGACY_AES_CFB_IV_SIZE], msg[LEGACY_AES_CFB_IV_SIZE:]
+            )
+
+        extracted_encrypted_msg = msg[len(AES_GCM_DATA_MARKER) + len(self.iv) :]
         return EncryptionHandler.decrypt_with_aes(self.aes_key, self.iv, extracted_encrypted_msg)
+
+
+class RSAKeyPool:
+    """Pool of pre-generated RSA private keys, bucketed by key size.
+
+    Keys are generated on a background daemon thread and every key is handed out only once, so taking a key from the
+    pool moves key generation off the request path without sharing keys between images or delaying interpreter exit.
+    """
+
+    def __init__(self, pool_size: int) -> None:
+        """Initialize the RSAKeyPool.
+
+        :param int pool_size: Number of keys to keep ready for each key size
+        """
+        self.pool_size = pool_size
+        self._pools: dict[int, queue.Queue[RSAPrivateKey]] = {}
+        self._pending: dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._requests: queue.Queue[int] = queue.Queue()
+        self._worker: threading.Thread | None = None
+
+    def _get_pool(self, private_key_size: int) -> queue.Queue[RSAPrivateKey]:
+        """Get the pool of keys for a key size, creating it if needed.
+
+        :param int private_key_size: Size of the RSA private keys
+        :return queue.Queue[RSAPrivateKey]: Pool of keys with the given size
+        """
+        with self._lock:
+            if private_key_size not in self._pools:
+                self._pools[private_key_size] = queue.Queue(maxsize=self.pool_size)
+            return self._pools[private_key_size]
+
+    def _add_key(self, private_key_size: int) -> None:
+        """Generate a key and add it to the pool for its size, unless the pool is already full.
+
+        :param int private_key_size: Size of the RSA private key
+        """
+        pool = self._get_pool(private_key_size)
+        if pool.full():
+            return
+
+        with suppress(queue.Full):
+            pool.put_nowait(EncryptionHandler.generate_private_key(private_key_size))
+
+    def _generate_keys(self) -> None:
+        """Generate the requested keys, one at a time, for as long as the process runs."""
+        while True:
+            private_key_size = self._requests.get()
+            try:
+                self._add_key(private_key_size)
+            finally:
+                with self._lock:
+                    self._pending[private_key_size] -= 1
+                self._requests.task_done()
+
+    def fill(self, private_key_size: int) -> None:
+        """Schedule background generation of keys until the pool for a key size is full.
+
+        Keys that are already scheduled count towards the pool, so calling this repeatedly does not queue extra work.
+
+        :param int private_key_size: Size of the RSA private keys
+        """
+        pool = self._get_pool(private_key_size)
+        with self._lock:
+            num_missing = self.pool_size - pool.qsize() - self._pending.get(private_key_size, 0)
+            if num_missing <= 0:
+                return
+
+            self._pending[private_key_size] = self._pending.get(private_key_size, 0) + num_missing
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._generate_keys, name="rsa-key-pool", daemon=True)
+                self._worker.start()
+
+        for _ in range(num_missing):
+            self._requests.put(private_key_size)
+
+    def get(self, private_key_size: int) -> RSAPrivateKey:
+        """Take a key from the pool, generating one if the pool is empty, and schedule a replacement.
+
+        :param int private_key_size: Size of the RSA private key
+        :return RSAPrivateKey: RSA private key that has not been handed out before
+        """
+        try:
+            private_key = self._get_pool(private_key_size).get_nowait()
+        except queue.Empty:
+            private_key = EncryptionHandler.generate_private_key(private_key_size)
+
+        self.fill(private_key_size)
+        return private_key
+
+
+RSA_KEY_POOL = RSAKeyPool(pool_size=RSA_KEY_POOL_SIZE)
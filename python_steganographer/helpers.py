@@ -1,10 +1,25 @@
 """Helper methods for the steganography application."""
 
-import base64
+import binascii
+from collections.abc import Iterable
 
 import numpy as np
+from numpy.typing import NDArray
 
-from python_steganographer.constants import BIT_MAP, NUM_BITS
+from python_steganographer.constants import MAX_BITS_PER_PIXEL, NUM_BITS
+
+# Bits of every ASCII character, indexed by character code
+_ASCII_CODES = np.arange(2**NUM_BITS, dtype=np.uint8)
+_CHAR_BITS = np.unpackbits(_ASCII_CODES[:, None], axis=1, bitorder="big")[:, MAX_BITS_PER_PIXEL - NUM_BITS :].copy()
+
+
+def bytes_to_ascii(msg: bytes) -> bytes:
+    """Convert bytes to base64 encoded ASCII bytes.
+
+    :param bytes msg: Bytes to convert
+    :return bytes: Base64 encoded ASCII representation of the bytes
+    """
+    return binascii.b2a_base64(msg, newline=False)
 
 
 def bytes_to_str(msg: bytes) -> str:
@@ -13,7 +28,7 @@ def bytes_to_str(msg: bytes) -> str:
     :param bytes msg: Bytes to convert
     :return str: Base64 encoded string representation of the bytes
     """
-    return base64.b64encode(msg).decode("utf-8")
+    return bytes_to_ascii(msg).decode("ascii")
 
 
 def str_to_bytes(msg: str) -> bytes:
@@ -23,36 +38,30 @@ def str_to_bytes(msg: str) -> bytes:
     :return bytes: Bytes representation of the base64 encoded string
     """
     padded_msg = msg + "=" * (-len(msg) % 4)
-    return base64.b64decode(padded_msg.encode("utf-8"))
+    return binascii.a2b_base64(padded_msg)
 
 
-def char_to_byte_list(char: str) -> list[int]:
-    """Convert an ASCII character to a list of bits of length 7.
+def msg_to_ascii(msg: str | bytes) -> bytes:
+    """Convert an ASCII message to bytes, passing messages that are already bytes through unchanged.
 
-    ```
-    char_to_byte_list("a") # [1, 1, 0, 0, 0, 0, 1]
-    ```
-
-    :param str char: Single ASCII character to convert to a list of bits
-    :return list[int]: List of bits representing the ASCII character, padded to length 7
+    :param str | bytes msg: Sequence of ASCII characters
+    :return bytes: ASCII encoded message
     """
-    char_bin = bin(ord(char))
-    char_bytes = char_bin[2:]
-    padding = [0] * (NUM_BITS - len(char_bytes))
-    return padding + [int(b) for b in char_bytes]
+    return msg.encode("ascii") if isinstance(msg, str) else msg
 
 
-def msg_to_bytes_list(msg: str) -> list[int]:
-    """Convert an ASCII message to a list of bytes of length (7 * length of message).
+def msg_to_bytes_list(msg: str | bytes) -> NDArray[np.uint8]:
+    """Convert an ASCII message to an array of bits of length (7 * length of message).
+
+    ```
+    msg_to_bytes_list("a") # [1, 1, 0, 0, 0, 0, 1]
+    ```
 
-    :param str msg: Sequence of ASCII characters
-        Sequence of ASCII characters
-    :return list[int]: List of bytes representing the ASCII message
+    :param str | bytes msg: Sequence of ASCII characters
+    :return NDArray[np.uint8]: Array of bits representing the ASCII message
     """
-    byte_list = []
-    for char in msg:
-        byte_list += char_to_byte_list(char)
-    return byte_list
+    msg_array = np.frombuffer(msg_to_ascii(msg), dtype=np.uint8)
+    return _CHAR_BITS[msg_array].reshape(-1)
 
 
 def byte_list_to_char(byte_list: list[int]) -> str:
@@ -65,32 +74,59 @@ def byte_list_to_char(byte_list: list[int]) -> str:
     :param list[int] byte_list: Character represented as a list of bits (up to 7 bits)
     :return str: Single ASCII character
     """
-    if len(byte_list) < NUM_BITS:
-        byte_list = [0] * (NUM_BITS - len(byte_list)) + byte_list
-    elif len(byte_list) > NUM_BITS:
-        byte_list = byte_list[:NUM_BITS]
+    # Shorter lists are implicitly left-padded with zeros, longer lists are truncated
+    char_value = 0
+    for bit in byte_list[:NUM_BITS]:
+        char_value = (char_value << 1) | (int(bit) & 1)
 
-    return chr(int(np.sum(BIT_MAP * byte_list)))
+    return chr(char_value)
 
 
-def bytes_list_to_msg(bytes_list: list[int]) -> str:
+def bytes_list_to_msg(bytes_list: list[int] | NDArray[np.uint8]) -> str:
     """Convert a list of bytes to a message.
 
-    :param list[int] bytes_list: Characters represented as a list of bits
+    Decoding stops at the first null character. Trailing bits that do not form a full character are decoded as one
+    last character, left-padded with zeros like `byte_list_to_char` does.
+
+    :param list[int] | NDArray[np.uint8] bytes_list: Characters represented as a list of bits
     :return str: Message in bytes_list
     """
-    char_list = []
-    i = 0
-    while i < len(bytes_list):
-        char_byte = bytes_list[i : i + NUM_BITS]
-        if not char_byte:
-            break
+    bits = np.asarray(bytes_list, dtype=np.uint8)
 
-        char = byte_list_to_char(char_byte)
-        if ord(char) == 0:
-            break
+    # Left-pad a trailing partial character with zeros, which only copies the bits when there is one
+    num_partial_bits = len(bits) % NUM_BITS
+    if num_partial_bits:
+        num_full_bits = len(bits) - num_partial_bits
+        padding = np.zeros(NUM_BITS - num_partial_bits, dtype=np.uint8)
+        bits = np.concatenate((bits[:num_full_bits], padding, bits[num_full_bits:]))
+
+    char_bits = bits.reshape(-1, NUM_BITS)
+
+    # Packing 7 bits pads the lowest bit with zero, so shift right instead of copying into a zero-padded matrix
+    chars = np.packbits(char_bits, axis=1, bitorder="big").reshape(-1) >> (MAX_BITS_PER_PIXEL - NUM_BITS)
+
+    # Find the null terminator with bytes.find (memchr) rather than building a mask over every character
+    msg_bytes = chars.tobytes()
+    end = msg_bytes.find(b"\0")
+    return (msg_bytes if end == -1 else msg_bytes[:end]).decode("ascii")
 
-        char_list.append(char)
-        i += NUM_BITS
 
-    return "".join(char_list)
+def bit_chunks_to_msg(bit_chunks: Iterable[NDArray[np.uint8]]) -> str:
+    """Convert consecutive chunks of bits to a message, stopping at the first null character.
+
+    Chunks are consumed lazily, so any work done to produce chunks after the null character is skipped. Every chunk
+    except the last must hold a multiple of 7 bits.
+
+    :param Iterable[NDArray[np.uint8]] bit_chunks: Consecutive chunks of bits representing the message
+    :return str: Message in bit_chunks
+    """
+    msg_chunks = []
+    for bits in bit_chunks:
+        msg_chunk = bytes_list_to_msg(bits)
+        msg_chunks.append(msg_chunk)
+
+        # A short chunk means the null terminator was found
+        if len(msg_chunk) < len(bits) // NUM_BITS:
+            break
+
+    return "".join(msg_chunks)
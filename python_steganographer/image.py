@@ -2,16 +2,23 @@
 
 from __future__ import annotations
 
-import io
+import mimetypes
+import struct
+from functools import cache
 
 import imageio.v3 as iio
 import numpy as np
-import skimage
 from numpy.typing import NDArray
 
 from python_steganographer.algorithm import AlgorithmBase, DCTAlgorithm, LSBAlgorithm
-from python_steganographer.encryption import EncryptionHandler
-from python_steganographer.helpers import bytes_to_str, str_to_bytes
+from python_steganographer.constants import (
+    PNG_COLOR_TYPE_CHANNELS,
+    PNG_COMPRESS_LEVEL,
+    PNG_HEADER_SIZE,
+    PNG_SIGNATURE,
+)
+from python_steganographer.encryption import RSA_KEY_POOL, EncryptionHandler
+from python_steganographer.helpers import bytes_to_ascii, str_to_bytes
 
 
 class Image:
@@ -21,6 +28,7 @@ class Image:
         """Initialize the Image class."""
         self.algorithm = algorithm
         self.array: NDArray[np.uint8] = np.array([])
+        self.shape: tuple[int, ...] = self.array.shape
 
     @classmethod
     def lsb(cls) -> Image:
@@ -45,12 +53,105 @@ class Image:
             )
         )
 
+    @staticmethod
+    @cache
+    def warm_up() -> None:
+        """Round trip a tiny PNG so that imageio loads its format plugin before the first request needs it.
+
+        The round trip only runs on the first call in each process.
+        """
+        image = Image.lsb()
+        image.load_array(np.zeros((1, 1, 3), dtype=np.uint8))
+        image.load_image(image.save_image_to_bytes("png"))
+
     def load_image(self, image_bytes: bytes) -> None:
         """Load image from bytes into array.
 
+        The bytes are decoded directly by imageio, which detects the format from the data.
+
+        :param bytes image_bytes: Image data as bytes
+        """
+        self.load_array(iio.imread(image_bytes))
+
+    def load_array(self, array: NDArray[np.uint8]) -> None:
+        """Load an already decoded image array.
+
+        The array is kept as C-contiguous uint8 so the algorithms' NumPy kernels run on their fast paths. Arrays that
+        already are C-contiguous uint8 are used without copying, and are modified in place by `encode`.
+
+        :param NDArray[np.uint8] array: Image array of shape (height, width, channels)
+        """
+        array = np.ascontiguousarray(array, dtype=np.uint8)
+        Image.validate_shape(array.shape)
+
+        self.array = array
+        self.shape = array.shape
+
+    def load_image_properties(self, image_bytes: bytes) -> None:
+        """Load the shape of an image from bytes without decoding its pixel data.
+
+        PNG shapes are read straight from the header, and other formats fall back to imageio. The pixel data is not
+        validated, so truncated or corrupt images are only rejected once they are loaded with `load_image`.
+
+        :param bytes image_bytes: Image data as bytes
+        """
+        shape = Image.read_png_shape(image_bytes) or iio.improps(image_bytes).shape
+        Image.validate_shape(shape)
+
+        self.shape = shape
+
+    @staticmethod
+    def read_png_shape(image_bytes: bytes) -> tuple[int, ...] | None:
+        """Read the shape of a PNG image from its IHDR chunk.
+
+        Palette images are not handled, since their number of channels depends on later chunks.
+
         :param bytes image_bytes: Image data as bytes
+        :return tuple[int, ...] | None: Shape the image decodes to, or None if it cannot be read from the header
+        """
+        # The IHDR chunk always comes first: length and type, then width, height, bit depth and colour type
+        if (
+            not image_bytes.startswith(PNG_SIGNATURE)
+            or image_bytes[12:16] != b"IHDR"
+            or len(image_bytes) < PNG_HEADER_SIZE
+        ):
+            return None
+
+        channels = PNG_COLOR_TYPE_CHANNELS.get(image_bytes[25])
+        if channels is None:
+            return None
+
+        width, height = struct.unpack(">II", image_bytes[16:24])
+        return (height, width) if channels == 1 else (height, width, channels)
+
+    @staticmethod
+    def validate_shape(shape: tuple[int, ...]) -> None:
+        """Check that an image shape has a channel axis.
+
+        :param tuple[int, ...] shape: Shape of the image
+        :raises ValueError: If the image does not have shape (height, width, channels)
         """
-        self.array = skimage.io.imread(io.BytesIO(image_bytes))
+        if len(shape) != 3:  # noqa: PLR2004
+            msg = f"Image must have shape (height, width, channels), got {shape}"
+            raise ValueError(msg)
+
+    @staticmethod
+    def get_file_extension(format_str: str) -> str:
+        """Get the file extension of an image format.
+
+        :param str format_str: Image format, with or without a leading dot
+        :return str: File extension with a leading dot
+        """
+        return f".{format_str}" if not format_str.startswith(".") else format_str
+
+    @staticmethod
+    def get_media_type(format_str: str) -> str:
+        """Get the media type of an image format, e.g. "image/jpeg" for "jpg".
+
+        :param str format_str: Image format, with or without a leading dot
+        :return str: Registered media type, or "application/octet-stream" for unknown formats
+        """
+        return mimetypes.types_map.get(Image.get_file_extension(format_str).lower(), "application/octet-stream")
 
     def save_image_to_bytes(self, format_str: str) -> bytes:
         """Save image array to bytes.
@@ -58,21 +159,20 @@ class Image:
         :param str format_str: Image format
         :return bytes: Image data as bytes
         """
-        file_extension = f".{format_str}" if not format_str.startswith(".") else format_str
-        buffer = io.BytesIO()
-        iio.imwrite(buffer, self.array, extension=file_extension)
-        buffer.seek(0)
-        return buffer.read()
+        file_extension = Image.get_file_extension(format_str)
 
-    def encode_channel(self, channel: int, msg: str) -> None:
+        # Embedded data is noise-like, so higher PNG compression levels cost time without shrinking the output much
+        write_kwargs = {"compress_level": PNG_COMPRESS_LEVEL} if file_extension == ".png" else {}
+        return iio.imwrite("<bytes>", self.array, extension=file_extension, **write_kwargs)
+
+    def encode_channel(self, channel: int, msg: str | bytes) -> None:
         """Insert message into specific channel.
 
         :param int channel: Channel to insert message into (0, 1, 2 for R, G, B respectively)
-        :param str msg: Message to insert
+        :param str | bytes msg: ASCII message to insert
         """
         channel_data = self.array[:, :, channel]
-        modified_channel = self.algorithm.embed_data(channel_data, msg)
-        self.array[:, :, channel] = modified_channel
+        self.algorithm.embed_data_in_place(channel_data, msg)
 
     def decode_channel(self, channel: int) -> str:
         """Extract message from specific channel.
@@ -89,19 +189,23 @@ class Image:
         :param str msg: Message to insert into the image
         """
         encryption_handler = EncryptionHandler(
-            private_key_size=private_key_size, iv_size=iv_size, aes_key_size=aes_key_size
+            private_key_size=private_key_size,
+            iv_size=iv_size,
+            aes_key_size=aes_key_size,
+            private_key=RSA_KEY_POOL.get(private_key_size),
         )
         encrypted_data, encrypted_aes_key = encryption_handler.encrypt(msg)
 
-        encrypted_data_str = bytes_to_str(encrypted_data)
-        encrypted_aes_key_str = bytes_to_str(encrypted_aes_key)
+        # Keep the base64 payloads as ASCII bytes, which the algorithms embed without another encoding pass
+        encrypted_data_ascii = bytes_to_ascii(encrypted_data)
+        encrypted_aes_key_ascii = bytes_to_ascii(encrypted_aes_key)
         private_key_str = EncryptionHandler.strip_pem_headers(
             EncryptionHandler.private_key_to_str(encryption_handler.private_key)
         )
 
-        self.encode_channel(0, encrypted_data_str)
-        self.encode_channel(1, encrypted_aes_key_str)
-        self.encode_channel(2, private_key_str)
+        self.algorithm.embed_channels_in_place(
+            self.array, [encrypted_data_ascii, encrypted_aes_key_ascii, private_key_str]
+        )
 
     def decode(self, iv_size: int) -> str:
         """Extract encrypted message from image array.
@@ -109,9 +213,8 @@ class Image:
         :param int iv_size: Size of the AES initialization vector in bytes
         :return str: Extracted message after decryption
         """
-        encrypted_data_str = self.decode_channel(0)
-        encrypted_aes_key_str = self.decode_channel(1)
-        private_key_str = EncryptionHandler.add_pem_headers(self.decode_channel(2))
+        encrypted_data_str, encrypted_aes_key_str, private_key_body = self.algorithm.extract_channels(self.array, 3)
+        private_key_str = EncryptionHandler.add_pem_headers(private_key_body)
 
         private_key = EncryptionHandler.str_to_private_key(private_key_str)
         encrypted_aes_key_bytes = str_to_bytes(encrypted_aes_key_str)
@@ -127,9 +230,9 @@ class Image:
         return encryption_handler.decrypt(encrypted_data_bytes)
 
     def get_capacity(self) -> int:
-        """Calculate the steganography capacity of the image array.
+        """Calculate the steganography capacity of the loaded image.
 
         :return int: Capacity in characters for hiding data in a single channel
         """
-        channel_shape = self.array[:, :, 0].shape
+        channel_shape = self.shape[:2]
         return self.algorithm.calculate_capacity(channel_shape)
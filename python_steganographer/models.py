@@ -2,7 +2,7 @@
 
 from enum import StrEnum, auto
 
-from pydantic import BaseModel, Field
+from pydantic import Base64Bytes, BaseModel, Field
 from python_template_server.models import BaseResponse, TemplateServerConfig
 
 
@@ -21,7 +21,7 @@ class EncryptionConfig(BaseModel):
     """Configuration model for encryption settings."""
 
     private_key_size: int = Field(default=2048, description="Size of the RSA private key in bits", ge=1024)
-    iv_size: int = Field(default=16, description="Size of the AES initialization vector in bytes", ge=8)
+    iv_size: int = Field(default=12, description="Size of the AES initialization vector in bytes", ge=8)
     aes_key_size: int = Field(default=32, description="Size of the AES key in bytes", ge=16)
 
 
@@ -63,7 +63,7 @@ class PostCapacityResponse(BaseResponse):
 class PostEncodeRequest(BaseModel):
     """Request model for encoding data into an image."""
 
-    image_data: str = Field(..., description="Base64-encoded image bytes")
+    image_data: Base64Bytes = Field(..., description="Base64-encoded image bytes")
     output_format: str = Field(..., description="Output image format")
     message: str = Field(..., description="The message to encode")
     algorithm: AlgorithmType = Field(..., description="The steganography algorithm to use")
@@ -72,12 +72,12 @@ class PostEncodeRequest(BaseModel):
 class PostDecodeRequest(BaseModel):
     """Request model for decoding data from an image."""
 
-    image_data: str = Field(..., description="Base64-encoded image bytes")
+    image_data: Base64Bytes = Field(..., description="Base64-encoded image bytes")
     algorithm: AlgorithmType = Field(..., description="The steganography algorithm to use")
 
 
 class PostCapacityRequest(BaseModel):
     """Request model for checking image capacity for steganography."""
 
-    image_data: str = Field(..., description="Base64-encoded image bytes")
+    image_data: Base64Bytes = Field(..., description="Base64-encoded image bytes")
     algorithm: AlgorithmType = Field(..., description="The steganography algorithm to use")
@@ -1,12 +1,16 @@
 """Image router with encoding and decoding endpoints."""
 
-import base64
+import asyncio
 import logging
+from typing import Annotated
 
-from fastapi import HTTPException, Request
+from fastapi import File, Form, HTTPException, Request, Response, UploadFile
 from python_template_server.models import ResponseCode
 from python_template_server.routers import BaseRouter
 
+from python_steganographer.algorithm import AlgorithmBase, DCTAlgorithm, LSBAlgorithm
+from python_steganographer.encryption import RSA_KEY_POOL
+from python_steganographer.helpers import bytes_to_str
 from python_steganographer.image import Image
 from python_steganographer.models import (
     AlgorithmType,
@@ -30,6 +34,18 @@ class ImageRouter(BaseRouter):
         """Configure the router with necessary dependencies."""
         self.image_config = image_config
         self.encryption_config = encryption_config
+        RSA_KEY_POOL.fill(encryption_config.private_key_size)
+        Image.warm_up()
+
+        # Algorithms hold no per-image state, so one instance of each is shared by all requests
+        self.algorithms: dict[AlgorithmType, AlgorithmBase] = {
+            AlgorithmType.LSB: LSBAlgorithm(),
+            AlgorithmType.DCT: DCTAlgorithm(
+                block_size=image_config.dct_block_size,
+                dct_coefficient=image_config.dct_coefficient,
+                quantization_factor=image_config.dct_quantization_factor,
+            ),
+        }
 
     def setup_routes(self) -> None:
         """Set up the API routes for image operations."""
@@ -57,6 +73,30 @@ class ImageRouter(BaseRouter):
             limited=True,
             authentication_required=True,
         )
+        self.add_route(
+            endpoint="/encode/upload",
+            handler_function=self.post_encode_upload,
+            response_model=None,
+            methods=["POST"],
+            limited=True,
+            authentication_required=True,
+        )
+        self.add_route(
+            endpoint="/decode/upload",
+            handler_function=self.post_decode_upload,
+            response_model=PostDecodeResponse,
+            methods=["POST"],
+            limited=True,
+            authentication_required=True,
+        )
+        self.add_route(
+            endpoint="/capacity/upload",
+            handler_function=self.post_capacity_upload,
+            response_model=PostCapacityResponse,
+            methods=["POST"],
+            limited=True,
+            authentication_required=True,
+        )
 
     def _get_image_instance_from_algorithm(self, algorithm: AlgorithmType) -> Image:
         """Get an Image instance based on the specified algorithm.
@@ -64,38 +104,101 @@ class ImageRouter(BaseRouter):
         :param AlgorithmType algorithm: The steganography algorithm
         :return Image: The corresponding Image instance
         """
-        match algorithm:
-            case AlgorithmType.LSB:
-                return Image.lsb()
-            case AlgorithmType.DCT:
-                return Image.dct(
-                    block_size=self.image_config.dct_block_size,
-                    dct_coefficient=self.image_config.dct_coefficient,
-                    quantization_factor=self.image_config.dct_quantization_factor,
-                )
+        return Image(algorithm=self.algorithms[algorithm])
+
+    def _encode_image_bytes(
+        self, image_bytes: bytes, message: str, algorithm: AlgorithmType, output_format: str
+    ) -> bytes:
+        """Encode a message into an image.
+
+        :param bytes image_bytes: Image data as bytes
+        :param str message: The message to encode
+        :param AlgorithmType algorithm: The steganography algorithm
+        :param str output_format: Output image format
+        :return bytes: Image data with the message embedded
+        """
+        image = self._get_image_instance_from_algorithm(algorithm=algorithm)
+        image.load_image(image_bytes=image_bytes)
+
+        image.encode(
+            msg=message,
+            private_key_size=self.encryption_config.private_key_size,
+            iv_size=self.encryption_config.iv_size,
+            aes_key_size=self.encryption_config.aes_key_size,
+        )
+
+        return image.save_image_to_bytes(format_str=output_format)
+
+    def _decode_image_bytes(self, image_bytes: bytes, algorithm: AlgorithmType) -> str:
+        """Extract a message from an image.
+
+        :param bytes image_bytes: Image data as bytes
+        :param AlgorithmType algorithm: The steganography algorithm
+        :return str: Decoded message
+        """
+        image = self._get_image_instance_from_algorithm(algorithm=algorithm)
+        image.load_image(image_bytes=image_bytes)
+        return image.decode(iv_size=self.encryption_config.iv_size)
+
+    def _get_image_bytes_capacity(self, image_bytes: bytes, algorithm: AlgorithmType) -> int:
+        """Calculate the steganography capacity of an image.
+
+        Only the image header is read, so a truncated or corrupt image still gets a capacity, even though encoding
+        into it would fail.
+
+        :param bytes image_bytes: Image data as bytes
+        :param AlgorithmType algorithm: The steganography algorithm
+        :return int: Capacity in characters for hiding data in a single channel
+        """
+        # Capacity only depends on the image shape, so the pixel data is not decoded
+        image = self._get_image_instance_from_algorithm(algorithm=algorithm)
+        image.load_image_properties(image_bytes=image_bytes)
+        return image.get_capacity()
+
+    def _encode_image(self, encode_request: PostEncodeRequest) -> str:
+        """Encode a message into the image of an encode request.
+
+        :param PostEncodeRequest encode_request: The validated encode request
+        :return str: Base64 encoded image data with the message embedded
+        """
+        encoded_image_bytes = self._encode_image_bytes(
+            image_bytes=encode_request.image_data,
+            message=encode_request.message,
+            algorithm=encode_request.algorithm,
+            output_format=encode_request.output_format,
+        )
+        return bytes_to_str(encoded_image_bytes)
+
+    def _decode_image(self, decode_request: PostDecodeRequest) -> str:
+        """Extract a message from the image of a decode request.
+
+        :param PostDecodeRequest decode_request: The validated decode request
+        :return str: Decoded message
+        """
+        return self._decode_image_bytes(image_bytes=decode_request.image_data, algorithm=decode_request.algorithm)
+
+    def _get_image_capacity(self, capacity_request: PostCapacityRequest) -> int:
+        """Calculate the steganography capacity of the image of a capacity request.
+
+        :param PostCapacityRequest capacity_request: The validated capacity request
+        :return int: Capacity in characters for hiding data in a single channel
+        """
+        return self._get_image_bytes_capacity(
+            image_bytes=capacity_request.image_data, algorithm=capacity_request.algorithm
+        )
 
     async def post_encode(self, request: Request) -> PostEncodeResponse:
         """Handle image encode requests - encode a message into an image.
 
+        The request body is parsed straight into the request model, and the CPU-bound work runs in a worker thread so
+        the event loop keeps serving other requests.
+
         :param Request request: The request object
         :return PostEncodeResponse: Server response with encoded image data
         """
         try:
-            encode_request = PostEncodeRequest.model_validate(await request.json())
-
-            image_bytes = base64.b64decode(encode_request.image_data)
-            image = self._get_image_instance_from_algorithm(algorithm=encode_request.algorithm)
-            image.load_image(image_bytes=image_bytes)
-
-            image.encode(
-                msg=encode_request.message,
-                private_key_size=self.encryption_config.private_key_size,
-                iv_size=self.encryption_config.iv_size,
-                aes_key_size=self.encryption_config.aes_key_size,
-            )
-
-            encoded_image_bytes = image.save_image_to_bytes(format_str=encode_request.output_format)
-            encoded_image_b64 = base64.b64encode(encoded_image_bytes).decode("utf-8")
+            encode_request = PostEncodeRequest.model_validate_json(await request.body())
+            encoded_image_b64 = await asyncio.to_thread(self._encode_image, encode_request)
 
             return PostEncodeResponse(
                 message="Image encoded successfully",
@@ -113,13 +216,8 @@ class ImageRouter(BaseRouter):
         :return PostDecodeResponse: Server response with decoded message
         """
         try:
-            decode_request = PostDecodeRequest.model_validate(await request.json())
-
-            image_bytes = base64.b64decode(decode_request.image_data)
-            image = self._get_image_instance_from_algorithm(algorithm=decode_request.algorithm)
-            image.load_image(image_bytes=image_bytes)
-
-            decoded_message = image.decode(iv_size=self.encryption_config.iv_size)
+            decode_request = PostDecodeRequest.model_validate_json(await request.body())
+            decoded_message = await asyncio.to_thread(self._decode_image, decode_request)
 
             return PostDecodeResponse(
                 message="Image decoded successfully",
@@ -133,17 +231,99 @@ class ImageRouter(BaseRouter):
     async def post_capacity(self, request: Request) -> PostCapacityResponse:
         """Handle capacity check requests - calculate steganography capacity of an image.
 
+        The capacity is calculated from the image header alone, without validating the pixel data.
+
         :param Request request: The request object
         :return PostCapacityResponse: Server response with capacity information
         """
         try:
-            capacity_request = PostCapacityRequest.model_validate(await request.json())
+            capacity_request = PostCapacityRequest.model_validate_json(await request.body())
+            capacity_characters = await asyncio.to_thread(self._get_image_capacity, capacity_request)
+
+            return PostCapacityResponse(
+                message="Capacity calculated successfully",
+                capacity_characters=capacity_characters,
+            )
+        except Exception as e:
+            error_msg = "Failed to calculate capacity"
+            logger.exception(error_msg)
+            raise HTTPException(status_code=ResponseCode.INTERNAL_SERVER_ERROR, detail=error_msg) from e
 
-            image_bytes = base64.b64decode(capacity_request.image_data)
-            image = self._get_image_instance_from_algorithm(algorithm=capacity_request.algorithm)
-            image.load_image(image_bytes=image_bytes)
+    async def post_encode_upload(
+        self,
+        request: Request,
+        file: Annotated[UploadFile, File(description="Image file")],
+        message: Annotated[str, Form(description="The message to encode")],
+        algorithm: Annotated[AlgorithmType, Form(description="The steganography algorithm to use")],
+        output_format: Annotated[str, Form(description="Output image format")],
+    ) -> Response:
+        """Handle image file encode requests - encode a message into an uploaded image.
+
+        The image is sent and returned as raw bytes, avoiding the base64 round trip of the JSON endpoint.
+
+        :param Request request: The request object
+        :param UploadFile file: The uploaded image file
+        :param str message: The message to encode
+        :param AlgorithmType algorithm: The steganography algorithm to use
+        :param str output_format: Output image format
+        :return Response: Encoded image bytes
+        """
+        try:
+            image_bytes = await file.read()
+            encoded_image_bytes = await asyncio.to_thread(
+                self._encode_image_bytes, image_bytes, message, algorithm, output_format
+            )
 
-            capacity_characters = image.get_capacity()
+            return Response(content=encoded_image_bytes, media_type=Image.get_media_type(output_format))
+        except Exception as e:
+            error_msg = "Failed to encode image"
+            logger.exception(error_msg)
+            raise HTTPException(status_code=ResponseCode.INTERNAL_SERVER_ERROR, detail=error_msg) from e
+
+    async def post_decode_upload(
+        self,
+        request: Request,
+        file: Annotated[UploadFile, File(description="Image file")],
+        algorithm: Annotated[AlgorithmType, Form(description="The steganography algorithm to use")],
+    ) -> PostDecodeResponse:
+        """Handle image file decode requests - extract a message from an uploaded image.
+
+        :param Request request: The request object
+        :param UploadFile file: The uploaded image file
+        :param AlgorithmType algorithm: The steganography algorithm to use
+        :return PostDecodeResponse: Server response with decoded message
+        """
+        try:
+            image_bytes = await file.read()
+            decoded_message = await asyncio.to_thread(self._decode_image_bytes, image_bytes, algorithm)
+
+            return PostDecodeResponse(
+                message="Image decoded successfully",
+                decoded_message=decoded_message,
+            )
+        except Exception as e:
+            error_msg = "Failed to decode image"
+            logger.exception(error_msg)
+            raise HTTPException(status_code=ResponseCode.INTERNAL_SERVER_ERROR, detail=error_msg) from e
+
+    async def post_capacity_upload(
+        self,
+        request: Request,
+        file: Annotated[UploadFile, File(description="Image file")],
+        algorithm: Annotated[AlgorithmType, Form(description="The steganography algorithm to use")],
+    ) -> PostCapacityResponse:
+        """Handle image file capacity check requests - calculate steganography capacity of an uploaded image.
+
+        The capacity is calculated from the image header alone, without validating the pixel data.
+
+        :param Request request: The request object
+        :param UploadFile file: The uploaded image file
+        :param AlgorithmType algorithm: The steganography algorithm to use
+        :return PostCapacityResponse: Server response with capacity information
+        """
+        try:
+            image_bytes = await file.read()
+            capacity_characters = await asyncio.to_thread(self._get_image_bytes_capacity, image_bytes, algorithm)
 
             return PostCapacityResponse(
                 message="Capacity calculated successfully",
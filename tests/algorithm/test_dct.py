@@ -1,8 +1,11 @@
 """Unit tests for the python_steganographer.algorithm.dct module."""
 
+import string
+
 import numpy as np
 import pytest
 from numpy.typing import NDArray
+from scipy.fft import dctn
 
 from python_steganographer.algorithm import DCTAlgorithm
 from python_steganographer.models import ImageConfig
@@ -11,24 +14,6 @@ from python_steganographer.models import ImageConfig
 class TestHelperFunctions:
     """Test the DCT helper functions."""
 
-    def test_apply_dct_2d_basic(self) -> None:
-        """Test basic 2D DCT application."""
-        # Create a simple 8x8 block
-        block = np.full((8, 8), 128, dtype=np.float64)
-
-        # Apply DCT
-        dct_result = DCTAlgorithm.apply_dct_2d(block)
-
-        # Should return same shape
-        assert dct_result.shape == (8, 8)
-
-        # For a constant block, only DC component should be non-zero
-        assert dct_result[0, 0] != 0  # DC component
-
-        # Other components should be very small (near zero)
-        assert np.allclose(dct_result[1:, :], 0, atol=1e-10)
-        assert np.allclose(dct_result[0, 1:], 0, atol=1e-10)
-
     def test_apply_idct_2d_basic(self) -> None:
         """Test basic 2D inverse DCT application."""
         # Create DCT coefficients with only DC component
@@ -45,111 +30,53 @@ class TestHelperFunctions:
         expected = np.full((8, 8), 128.0)
         assert np.allclose(result, expected, atol=1e-10)
 
-    def test_dct_idct_roundtrip(self) -> None:
-        """Test that DCT followed by IDCT reconstructs the original."""
-        # Create a random 8x8 block
-        rng = np.random.default_rng(42)
-        original_block = rng.random((8, 8)).astype(np.float64) * 255
-
-        # Apply DCT then IDCT
-        dct_result = DCTAlgorithm.apply_dct_2d(original_block)
-        reconstructed = DCTAlgorithm.apply_idct_2d(dct_result)
-
-        # Should be very close to original
-        assert np.allclose(original_block, reconstructed, atol=1e-10)
-
-    def test_split_into_blocks_exact_division(self) -> None:
-        """Test splitting when image size is exactly divisible by block size."""
-        # Create 16x16 image (2x2 blocks of 8x8)
-        image = np.arange(256, dtype=np.uint8).reshape(16, 16)
-        blocks = DCTAlgorithm.split_into_blocks(image, block_size=8)
-
-        # Should have 4 blocks (2x2)
-        assert len(blocks) == 4  # noqa: PLR2004
-
-        # Each block should be 8x8
-        for block in blocks:
-            assert block.shape == (8, 8)
-            assert block.dtype == np.float64
-
-    def test_split_into_blocks_non_exact_division(self) -> None:
-        """Test splitting when image size is not exactly divisible."""
-        # Create 15x15 image (should only get 1 8x8 block)
-        image = np.arange(225, dtype=np.uint8).reshape(15, 15)
-
-        blocks = DCTAlgorithm.split_into_blocks(image, block_size=8)
-
-        # Should have 1 block (only complete 8x8 fits)
-        assert len(blocks) == 1
-        assert blocks[0].shape == (8, 8)
-
-    def test_reconstruct_from_blocks_exact(self) -> None:
-        """Test reconstruction when blocks fit exactly."""
-        # Create original image
-        original = np.arange(64, dtype=np.uint8).reshape(8, 8)
-
-        # Split and reconstruct
-        blocks = DCTAlgorithm.split_into_blocks(original, block_size=8)
-        reconstructed = DCTAlgorithm.reconstruct_from_blocks(blocks, original.shape, block_size=8)
-
-        # Should be identical to original
-        np.testing.assert_array_equal(reconstructed, original)
-
-    def test_reconstruct_from_blocks_clipping(self) -> None:
-        """Test that reconstruction clips values to valid range."""
-        # Create blocks with out-of-range values
-        max_val = 255
-        delta = 55
-        blocks = [
-            np.full((8, 8), max_val + delta, dtype=np.float64),  # Above 255
-            np.full((8, 8), -delta, dtype=np.float64),  # Below 0
-        ]
-
-        reconstructed = DCTAlgorithm.reconstruct_from_blocks(blocks, (8, 16), block_size=8)
-
-        # Values should be clipped to [0, 255]
-        assert np.all(reconstructed >= 0)
-        assert np.all(reconstructed <= max_val)
-        assert reconstructed.dtype == np.uint8
+    def test_project_onto_basis_matches_dct(self) -> None:
+        """Test that projecting blocks onto a basis function gives the matching DCT coefficient."""
+        blocks = np.random.default_rng(0).integers(0, 256, size=(16, 8, 8)).astype(np.float32)
+        basis = DCTAlgorithm.get_dct_basis(1, 2, block_size=8)
 
-    @pytest.mark.parametrize(
-        ("coeff", "expected"),
-        [
-            (10.5, 0),
-            (15.3, 20),
-            (20.7, 20),
-            (25.1, 20),
-        ],
-    )
-    def test_embed_bit_in_dct_coefficient_bit(self, coeff: float, expected: int) -> None:
-        """Test embedding bit in DCT coefficient."""
-        quantization = 10
-        assert DCTAlgorithm.embed_bit_in_dct_coefficient(coeff, 0, quantization) == expected
+        coeffs = DCTAlgorithm.project_onto_basis(blocks, basis)
 
-    @pytest.mark.parametrize(
-        ("coeff", "expected"),
-        [
-            (10.5, 1),  # Quantizes to 1, which is odd
-            (15.3, 0),  # Quantizes to 2, which is even
-            (20.7, 0),  # Quantizes to 2, which is even
-            (25.1, 1),  # Quantizes to 3, which is odd
-        ],
-    )
-    def test_extract_bit_from_dct_coefficient(self, coeff: float, expected: int) -> None:
-        """Test extracting bit from quantized coefficient."""
-        result = DCTAlgorithm.extract_bit_from_dct_coefficient(coeff, 10)
-        assert result == expected
+        np.testing.assert_allclose(coeffs, dctn(blocks, axes=(-2, -1), norm="ortho")[:, 1, 2], atol=1e-3)
 
-    def test_embedding_extraction_roundtrip(self) -> None:
-        """Test that embedding and extraction work together."""
-        test_coeff = 17.3
-        quantization = 10
+    def test_get_block_view_is_view(self) -> None:
+        """Test that the block view shares memory with the channel and orders blocks row-major."""
+        image = np.arange(16 * 24, dtype=np.uint16).reshape(16, 24).astype(np.uint8)
+        block_grid = DCTAlgorithm.get_block_view(image, block_size=8)
 
-        # Test both bits
-        for bit in [0, 1]:
-            embedded = DCTAlgorithm.embed_bit_in_dct_coefficient(test_coeff, bit, quantization)
-            extracted = DCTAlgorithm.extract_bit_from_dct_coefficient(embedded, quantization)
-            assert extracted == bit
+        assert block_grid.shape == (2, 3, 8, 8)
+        assert np.shares_memory(block_grid, image)
+        np.testing.assert_array_equal(block_grid[1, 2], image[8:16, 16:24])
+
+        rows, cols = DCTAlgorithm.get_block_positions(2, 5, block_grid.shape[1])
+        np.testing.assert_array_equal(rows, [0, 1, 1])
+        np.testing.assert_array_equal(cols, [2, 0, 1])
+
+    def test_embed_bits_in_dct_coefficients(self) -> None:
+        """Test that embedding sets the parity of each quantized coefficient to its bit."""
+        coeffs = np.array([10.5, 15.3, 20.7, 25.1, -17.3, -25.1], dtype=np.float64)
+        bits = np.array([0, 1, 0, 1, 0, 1], dtype=np.uint8)
+
+        result = DCTAlgorithm.embed_bits_in_dct_coefficients(coeffs, bits, 10)
+        np.testing.assert_array_equal(result, [0, 30, 20, 30, -20, -30])
+
+    def test_embed_bits_in_dct_coefficients_float32(self) -> None:
+        """Test that single precision coefficients are embedded without promoting to double precision."""
+        dct_coeffs = np.array([-33.7, -4.2, 0.0, 9.9, 47.1], dtype=np.float32)
+        bits = np.array([1, 0, 1, 1, 0], dtype=np.uint8)
+
+        modified = DCTAlgorithm.embed_bits_in_dct_coefficients(dct_coeffs, bits, 10)
+
+        assert modified.dtype == np.float32
+        np.testing.assert_array_equal(DCTAlgorithm.extract_bits_from_dct_coefficients(modified, 10), bits)
+
+    def test_extract_bits_from_dct_coefficients(self) -> None:
+        """Test extracting bits from the parity of each quantized coefficient."""
+        # Quantizes to 1, 2, 2, 3, -2, -3
+        coeffs = np.array([10.5, 15.3, 20.7, 25.1, -17.3, -25.1], dtype=np.float64)
+
+        result = DCTAlgorithm.extract_bits_from_dct_coefficients(coeffs, 10)
+        np.testing.assert_array_equal(result, [1, 0, 0, 1, 0, 1])
 
 
 class TestAlgorithm:
@@ -266,7 +193,7 @@ class TestAlgorithm:
         """Test roundtrip with various message types."""
         modified_channel = dct_algorithm.embed_data(mock_image_channel, message)
         extracted = dct_algorithm.extract_data(modified_channel)
-        assert message in extracted
+        assert extracted == message
 
     def test_embed_extract_roundtrip_non_square_image(self, dct_algorithm: DCTAlgorithm) -> None:
         """Test with non-square image."""
@@ -277,7 +204,53 @@ class TestAlgorithm:
         # Should work fine
         modified = dct_algorithm.embed_data(rect_image, message)
         extracted = dct_algorithm.extract_data(modified)
-        assert message in extracted
+        assert extracted == message
+
+    def test_embed_extract_roundtrip_saturated_channel(self, dct_algorithm: DCTAlgorithm) -> None:
+        """Test roundtrip in a flat white channel, where every change to the blocks is clipped at 255."""
+        white_channel = np.full((256, 256), 255, dtype=np.uint8)
+        message = (string.ascii_letters + string.digits + "+/=") * 2
+
+        dct_algorithm.embed_data_in_place(white_channel, message)
+        assert dct_algorithm.extract_data(white_channel) == message
+
+    def test_embed_data_only_modifies_message_blocks(self, dct_algorithm: DCTAlgorithm) -> None:
+        """Test that blocks after the message and pixels outside the block grid are left untouched."""
+        rng = np.random.default_rng(0)
+        image = rng.integers(0, 256, size=(85, 99), dtype=np.uint8)
+        message = "Hi"
+
+        modified = dct_algorithm.embed_data(image, message)
+        num_bits = (len(message) + 1) * 7
+
+        # Blocks after the message and the partial blocks on the edges are unchanged
+        original_blocks = DCTAlgorithm.get_block_view(image, 8).reshape(-1, 8, 8)
+        modified_blocks = DCTAlgorithm.get_block_view(modified, 8).reshape(-1, 8, 8)
+        np.testing.assert_array_equal(modified_blocks[num_bits:], original_blocks[num_bits:])
+        np.testing.assert_array_equal(modified[80:], image[80:])
+        np.testing.assert_array_equal(modified[:, 96:], image[:, 96:])
+        assert dct_algorithm.extract_data(modified) == message
+
+    def test_embed_data_in_place_strided_channel(
+        self, dct_algorithm: DCTAlgorithm, mock_image: NDArray[np.uint8]
+    ) -> None:
+        """Test embedding in place into a non-contiguous channel view of an image."""
+        original_message = "Hi"
+        image = mock_image.copy()
+
+        dct_algorithm.embed_data_in_place(image[:, :, 1], original_message)
+
+        np.testing.assert_array_equal(image[:, :, [0, 2]], mock_image[:, :, [0, 2]])
+        assert dct_algorithm.extract_data(image[:, :, 1]) == original_message
+
+    def test_embed_extract_channels_roundtrip(self, dct_algorithm: DCTAlgorithm, mock_image: NDArray[np.uint8]) -> None:
+        """Test embedding and extracting different data in each channel."""
+        messages = ["R", "G", "B"]
+
+        embedded_image = dct_algorithm.embed_channels(mock_image, messages)
+
+        assert embedded_image.shape == mock_image.shape
+        assert dct_algorithm.extract_channels(embedded_image, len(messages)) == messages
 
     @pytest.mark.parametrize(
         ("shape", "expected_capacity"),
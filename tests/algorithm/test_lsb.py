@@ -5,7 +5,7 @@ import pytest
 from numpy.typing import NDArray
 
 from python_steganographer.algorithm import LSBAlgorithm
-from python_steganographer.constants import NUM_BITS
+from python_steganographer.constants import EXTRACT_CHUNK_CHARS, NUM_BITS
 
 
 class TestHelperFunctions:
@@ -21,7 +21,7 @@ class TestHelperFunctions:
     def test_insert_msg_basic(self, mock_image_channel: NDArray[np.uint8]) -> None:
         """Test basic message insertion."""
         # Create a simple test image (all even values) and flatten it
-        test_img = LSBAlgorithm.even_img(mock_image_channel).flatten()
+        test_img = LSBAlgorithm.even_img(mock_image_channel).ravel()
 
         # Insert simple message
         message = "A"  # ASCII 65 = 1000001 in binary (7 bits)
@@ -34,6 +34,21 @@ class TestHelperFunctions:
         assert len(extracted_bits) >= len(expected_bits)
         np.testing.assert_array_equal(extracted_bits[:7], expected_bits[:7])
 
+    def test_insert_msg_only_modifies_message_pixels(self, mock_image_channel: NDArray[np.uint8]) -> None:
+        """Test that only the message and null terminator pixels are modified."""
+        original = mock_image_channel.ravel()
+        flattened = original.copy()
+        message = "Hi"
+        num_bits = (len(message) + 1) * NUM_BITS
+
+        result = LSBAlgorithm.insert_msg(flattened, message)
+
+        np.testing.assert_array_equal(
+            result[:num_bits] % 2, [1, 0, 0, 1, 0, 0, 0, 1, 1, 0, 1, 0, 0, 1] + [0] * NUM_BITS
+        )
+        np.testing.assert_array_equal(result[num_bits:], original[num_bits:])
+        assert result is flattened
+
     def test_insert_msg_capacity_error(self) -> None:
         """Test that insert_msg raises error when message is too large."""
         small_img = np.array([0, 2, 4], dtype=np.uint8)  # Only 3 pixels
@@ -49,7 +64,13 @@ class TestHelperFunctions:
 
         # Extract should find the message
         result = LSBAlgorithm.extract_msg(test_img)
-        assert "A" in result
+        assert result == "A"
+
+    def test_extract_msg_across_chunks(self, mock_big_image: NDArray[np.uint8]) -> None:
+        """Test extracting a message longer than a single extraction chunk."""
+        original_msg = "abc" * EXTRACT_CHUNK_CHARS
+        modified = LSBAlgorithm.insert_msg(mock_big_image[:, :, 0].flatten(), original_msg)
+        assert LSBAlgorithm.extract_msg(modified) == original_msg
 
     def test_roundtrip_message(self, mock_image_channel: NDArray[np.uint8]) -> None:
         """Test that a message can be inserted and extracted correctly."""
@@ -62,8 +83,8 @@ class TestHelperFunctions:
         # Extract message
         extracted = LSBAlgorithm.extract_msg(modified)
 
-        # Should be able to find the original message
-        assert original_msg in extracted
+        # Extraction stops at the null terminator
+        assert extracted == original_msg
 
 
 class TestAlgorithm:
@@ -78,6 +99,7 @@ class TestAlgorithm:
         assert isinstance(result, np.ndarray)
         assert result.shape == mock_image_channel.shape
         assert result.dtype == mock_image_channel.dtype
+        assert not np.shares_memory(result, mock_image_channel)
 
     def test_embed_data_message_too_large(
         self, lsb_algorithm: LSBAlgorithm, mock_image_channel: NDArray[np.uint8]
@@ -104,8 +126,66 @@ class TestAlgorithm:
         # Extract the message
         extracted_message = lsb_algorithm.extract_data(embedded_channel)
 
-        # The original message should be contained in the extracted message
-        assert original_message in extracted_message
+        # Extraction stops at the null terminator
+        assert extracted_message == original_message
+
+    def test_embed_data_in_place_strided_channel(
+        self, lsb_algorithm: LSBAlgorithm, mock_image: NDArray[np.uint8]
+    ) -> None:
+        """Test embedding in place into a non-contiguous channel view of an image."""
+        original_message = "In place"
+        image = mock_image.copy()
+
+        lsb_algorithm.embed_data_in_place(image[:, :, 1], original_message)
+
+        np.testing.assert_array_equal(image[:, :, [0, 2]], mock_image[:, :, [0, 2]])
+        assert lsb_algorithm.extract_data(image[:, :, 1]) == original_message
+
+    def test_extract_data_strided_channel(self, lsb_algorithm: LSBAlgorithm, mock_image: NDArray[np.uint8]) -> None:
+        """Test extraction from a non-contiguous channel view of an image."""
+        original_message = "Strided"
+        image = mock_image.copy()
+        image[:, :, 1] = lsb_algorithm.embed_data(image[:, :, 1], original_message)
+
+        channel_view = image[:, :, 1]
+        assert not channel_view.flags.c_contiguous
+        assert lsb_algorithm.extract_data(channel_view) == original_message
+
+    def test_embed_extract_channels_roundtrip(self, lsb_algorithm: LSBAlgorithm, mock_image: NDArray[np.uint8]) -> None:
+        """Test embedding and extracting different data in each channel."""
+        messages = ["Red", "Green", "Blue"]
+
+        embedded_image = lsb_algorithm.embed_channels(mock_image, messages)
+
+        assert embedded_image.shape == mock_image.shape
+        assert not np.shares_memory(embedded_image, mock_image)
+        assert lsb_algorithm.extract_channels(embedded_image, len(messages)) == messages
+
+    def test_embed_channels_in_place_matches_per_channel(
+        self, lsb_algorithm: LSBAlgorithm, mock_image: NDArray[np.uint8]
+    ) -> None:
+        """Test that the fused embedding gives the same image as embedding each channel separately."""
+        messages: list[str | bytes] = ["Red", b"Green message", "B" * 585]
+        expected_image = mock_image.copy()
+        for channel, message in enumerate(messages):
+            lsb_algorithm.embed_data_in_place(expected_image[:, :, channel], message)
+
+        image = mock_image.copy()
+        lsb_algorithm.embed_channels_in_place(image, messages)
+
+        np.testing.assert_array_equal(image, expected_image)
+
+    def test_embed_channels_in_place_non_contiguous(
+        self, lsb_algorithm: LSBAlgorithm, mock_image: NDArray[np.uint8]
+    ) -> None:
+        """Test that non-contiguous images are embedded in place channel by channel."""
+        messages: list[str | bytes] = ["Red", "Green"]
+        image = mock_image.copy()
+        image_view = image[:, ::2]
+
+        lsb_algorithm.embed_channels_in_place(image_view, messages)
+
+        assert lsb_algorithm.extract_channels(image[:, ::2], len(messages)) == messages
 
     @pytest.mark.parametrize(
         ("shape", "expected_capacity"),
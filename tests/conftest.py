@@ -2,6 +2,7 @@
 
 import base64
 from collections.abc import Generator
+from math import prod
 from unittest.mock import MagicMock, patch
 
 import numpy as np
@@ -26,20 +27,29 @@ from python_steganographer.server import IMAGE_ROUTER
 rng = np.random.default_rng(42)
 
 
+def random_image(shape: tuple[int, ...]) -> NDArray[np.uint8]:
+    """Create a read-only image of uniformly random bytes.
+
+    :param tuple[int, ...] shape: Shape of the image
+    :return NDArray[np.uint8]: Read-only array of random pixel values
+    """
+    return np.frombuffer(rng.bytes(prod(shape)), dtype=np.uint8).reshape(shape)
+
+
 # Steganographer Server Configuration fixtures
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_image_config() -> ImageConfig:
     """Provide a mock ImageConfig instance."""
     return ImageConfig(dct_block_size=8, dct_coefficient=3, dct_quantization_factor=10)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_encryption_config() -> EncryptionConfig:
     """Provide a mock EncryptionConfig instance."""
     return EncryptionConfig(private_key_size=1024, iv_size=16, aes_key_size=32)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_steganographer_server_config(
     mock_image_config: ImageConfig, mock_encryption_config: EncryptionConfig
 ) -> SteganographerServerConfig:
@@ -48,48 +58,63 @@ def mock_steganographer_server_config(
 
 
 # API Request fixtures
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_post_encode_request(mock_big_image_bytes: bytes) -> PostEncodeRequest:
     """Provide a mock PostEncodeRequest instance."""
-    image_data = base64.b64encode(mock_big_image_bytes).decode("utf-8")
     return PostEncodeRequest(
-        image_data=image_data,
+        image_data=base64.b64encode(mock_big_image_bytes),
         output_format="png",
         message="Test message",
         algorithm=AlgorithmType.LSB,
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_post_decode_request(mock_big_image_bytes: bytes) -> PostDecodeRequest:
     """Provide a mock PostDecodeRequest instance."""
-    image_data = base64.b64encode(mock_big_image_bytes).decode("utf-8")
     return PostDecodeRequest(
-        image_data=image_data,
+        image_data=base64.b64encode(mock_big_image_bytes),
         algorithm=AlgorithmType.LSB,
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_post_capacity_request(mock_big_image_bytes: bytes) -> PostCapacityRequest:
     """Provide a mock PostCapacityRequest instance."""
-    image_data = base64.b64encode(mock_big_image_bytes).decode("utf-8")
     return PostCapacityRequest(
-        image_data=image_data,
+        image_data=base64.b64encode(mock_big_image_bytes),
         algorithm=AlgorithmType.LSB,
     )
 
 
+@pytest.fixture(scope="session")
+def mock_post_encode_body(mock_post_encode_request: PostEncodeRequest) -> bytes:
+    """Provide the JSON body of the mock PostEncodeRequest, serialized once per session."""
+    return mock_post_encode_request.model_dump_json().encode()
+
+
+@pytest.fixture(scope="session")
+def mock_post_decode_body(mock_post_decode_request: PostDecodeRequest) -> bytes:
+    """Provide the JSON body of the mock PostDecodeRequest, serialized once per session."""
+    return mock_post_decode_request.model_dump_json().encode()
+
+
+@pytest.fixture(scope="session")
+def mock_post_capacity_body(mock_post_capacity_request: PostCapacityRequest) -> bytes:
+    """Provide the JSON body of the mock PostCapacityRequest, serialized once per session."""
+    return mock_post_capacity_request.model_dump_json().encode()
+
+
 # Algorithm fixtures
-@pytest.fixture
+@pytest.fixture(scope="session")
 def lsb_algorithm() -> LSBAlgorithm:
-    """Create LSB algorithm instance."""
+    """Create an LSB algorithm instance shared by all tests, as the server shares one across requests."""
     return LSBAlgorithm()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def dct_algorithm(mock_image_config: ImageConfig) -> DCTAlgorithm:
-    """Create DCT algorithm instance."""
+    """Create a DCT algorithm instance shared by all tests, as the server shares one across requests."""
     return DCTAlgorithm(
         block_size=mock_image_config.dct_block_size,
         dct_coefficient=mock_image_config.dct_coefficient,
@@ -98,50 +123,51 @@ def dct_algorithm(mock_image_config: ImageConfig) -> DCTAlgorithm:
 
 
 # Image fixtures
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_image() -> NDArray[np.uint8]:
-    """Create a sample 64x64x3 image for testing."""
-    return rng.integers(0, 256, size=(64, 64, 3), dtype=np.uint8)
+    """Create a read-only sample 64x64x3 image shared by all tests."""
+    return random_image((64, 64, 3))
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_big_image() -> NDArray[np.uint8]:
-    """Create a sample 640x640x3 image for testing."""
-    return rng.integers(0, 256, size=(640, 640, 3), dtype=np.uint8)
+    """Create a read-only sample 640x640x3 image shared by all tests."""
+    return random_image((640, 640, 3))
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_image_channel(mock_image: NDArray[np.uint8]) -> NDArray[np.uint8]:
-    """Create a sample 64x64 image channel for testing."""
+    """Create a read-only sample 64x64 image channel shared by all tests."""
     return mock_image[:, :, 0]
 
 
 @pytest.fixture
 def mock_load_image(mock_big_image: NDArray[np.uint8]) -> Generator[MagicMock]:
     """Fixture to mock image loading from file."""
-    with patch("python_steganographer.image.skimage.io.imread", return_value=mock_big_image) as mock_imread:
+    # Images are encoded in place, so every load gets its own writable copy like a real decode would
+    with patch("python_steganographer.image.iio.imread", side_effect=lambda *_: mock_big_image.copy()) as mock_imread:
         yield mock_imread
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_big_image_bytes(mock_big_image: NDArray[np.uint8]) -> bytes:
     """Provide bytes of a mock big image."""
     return mock_big_image.tobytes()
 
 
 @pytest.fixture
-def mock_image_instance_lsb(mock_load_image: MagicMock, mock_big_image_bytes: bytes) -> Image:
+def mock_image_instance_lsb(mock_big_image: NDArray[np.uint8]) -> Image:
     """Create an Image instance with LSB algorithm."""
     mock_image_instance = Image.lsb()
-    mock_image_instance.load_image(image_bytes=mock_big_image_bytes)
+    mock_image_instance.load_array(mock_big_image.copy())
     return mock_image_instance
 
 
 @pytest.fixture
-def mock_image_instance_dct(mock_load_image: MagicMock, mock_big_image_bytes: bytes) -> Image:
+def mock_image_instance_dct(mock_big_image: NDArray[np.uint8]) -> Image:
     """Create an Image instance with DCT algorithm."""
     mock_image_instance = Image.dct(block_size=8, dct_coefficient=3, quantization_factor=10)
-    mock_image_instance.load_image(image_bytes=mock_big_image_bytes)
+    mock_image_instance.load_array(mock_big_image.copy())
     return mock_image_instance
 
 
@@ -2,33 +2,63 @@
 
 import asyncio
 from collections.abc import Generator
+from typing import NamedTuple, NoReturn
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-from fastapi import HTTPException, Request
+from fastapi import HTTPException, Request, UploadFile
 from fastapi.routing import APIRoute
+from starlette.types import Message
 
+from python_steganographer.algorithm import DCTAlgorithm, LSBAlgorithm
 from python_steganographer.image import Image
 from python_steganographer.models import (
-    PostCapacityRequest,
-    PostDecodeRequest,
-    PostEncodeRequest,
+    AlgorithmType,
+    EncryptionConfig,
+    ImageConfig,
 )
 from python_steganographer.routers import ImageRouter
 
 
+def make_request(body: bytes) -> Request:
+    """Build a Request whose body is read from a minimal ASGI scope.
+
+    :param bytes body: Raw request body
+    :return Request: POST request with the given body
+    """
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return Request({"type": "http", "method": "POST", "headers": []}, receive)
+
+
+@pytest.fixture(scope="module")
+def event_runner() -> Generator[asyncio.Runner]:
+    """Provide an event loop runner shared by the tests in this module."""
+    with asyncio.Runner() as runner:
+        yield runner
+
+
+def raise_processing_error(*_args: object, **_kwargs: object) -> NoReturn:
+    """Stand in for an Image method that fails."""
+    msg = "Processing failed"
+    raise RuntimeError(msg)
+
+
 @pytest.fixture(autouse=True)
-def mock_image_instance(mock_image_instance_lsb: Image) -> Generator[Image]:
+def mock_image_instance(
+    monkeypatch: pytest.MonkeyPatch, mock_load_image: MagicMock, mock_image_instance_lsb: Image
+) -> Image:
     """Provide a mock Image instance."""
-    with (
-        patch(
-            "python_steganographer.routers.image_router.ImageRouter._get_image_instance_from_algorithm",
-            return_value=mock_image_instance_lsb,
-        ),
-        patch.object(mock_image_instance_lsb, "encode"),
-        patch.object(mock_image_instance_lsb, "decode", return_value="Decoded message"),
-    ):
-        yield mock_image_instance_lsb
+    monkeypatch.setattr(
+        ImageRouter, "_get_image_instance_from_algorithm", lambda *_args, **_kwargs: mock_image_instance_lsb
+    )
+
+    # The instance is created for each test, so its methods can be replaced without restoring them afterwards
+    mock_image_instance_lsb.encode = lambda *_args, **_kwargs: None  # type: ignore[method-assign]
+    mock_image_instance_lsb.decode = lambda *_args, **_kwargs: "Decoded message"  # type: ignore[method-assign]
+    return mock_image_instance_lsb
 
 
 class TestRoutes:
@@ -36,96 +66,187 @@ class TestRoutes:
 
     def test_setup_routes(self, mock_image_router: ImageRouter) -> None:
         """Test that routes are set up correctly."""
-        api_routes = [route for route in mock_image_router.router.routes if isinstance(route, APIRoute)]
-        routes = [route.path for route in api_routes]
-        expected_endpoints = [
+        routes = {route.path for route in mock_image_router.router.routes if isinstance(route, APIRoute)}
+        expected_endpoints = {
             "/image/encode",
             "/image/decode",
             "/image/capacity",
-        ]
-        for endpoint in expected_endpoints:
-            assert endpoint in routes, f"Expected endpoint {endpoint} not found in routes"
+            "/image/encode/upload",
+            "/image/decode/upload",
+            "/image/capacity/upload",
+        }
+        assert expected_endpoints <= routes, f"Expected endpoints {expected_endpoints - routes} not found in routes"
+
+
+class TestAlgorithms:
+    """Unit tests for the algorithm instances shared by ImageRouter requests."""
+
+    def test_configure_router_algorithms(self, mock_image_router: ImageRouter, mock_image_config: ImageConfig) -> None:
+        """Test that one algorithm instance is configured for each algorithm type."""
+        assert set(mock_image_router.algorithms) == set(AlgorithmType)
+        assert isinstance(mock_image_router.algorithms[AlgorithmType.LSB], LSBAlgorithm)
+
+        dct_algorithm = mock_image_router.algorithms[AlgorithmType.DCT]
+        assert isinstance(dct_algorithm, DCTAlgorithm)
+        assert dct_algorithm.block_size == mock_image_config.dct_block_size
+        assert dct_algorithm.dct_coefficient == mock_image_config.dct_coefficient
+        assert dct_algorithm.quantization_factor == mock_image_config.dct_quantization_factor
+
+    def test_configure_router_warms_up_image_codecs(
+        self,
+        mock_image_router: ImageRouter,
+        mock_image_config: ImageConfig,
+        mock_encryption_config: EncryptionConfig,
+    ) -> None:
+        """Test that the image codecs are loaded when the router is configured."""
+        with patch("python_steganographer.routers.image_router.Image.warm_up") as mock_warm_up:
+            mock_image_router.configure_router(image_config=mock_image_config, encryption_config=mock_encryption_config)
 
+        mock_warm_up.assert_called_once_with()
 
-class TestPostEncodeEndpoint:
-    """Integration and unit tests for the /image/encode endpoint."""
 
-    @pytest.fixture
-    def mock_request_object(self, mock_post_encode_request: PostEncodeRequest) -> Request:
-        """Provide a mock Request object with JSON data."""
-        request = MagicMock(spec=Request)
-        request.json = AsyncMock(return_value=mock_post_encode_request.model_dump())
-        return request
+class EndpointCase(NamedTuple):
+    """Expected behaviour of one of the JSON image endpoints."""
 
-    def test_post_encode(self, mock_image_router: ImageRouter, mock_request_object: Request) -> None:
-        """Test the /image/encode method handles valid JSON and returns a model reply."""
-        response = asyncio.run(mock_image_router.post_encode(mock_request_object))
+    endpoint: str
+    mocked_method: str
+    expected_message: str
+    result_field: str
+    result_type: type
+    error_regex: str
 
-        assert response.message == "Image encoded successfully"
-        assert isinstance(response.image_data, str)
 
-    def test_post_encode_error(
-        self, mock_image_router: ImageRouter, mock_request_object: Request, mock_image_instance: Image
-    ) -> None:
-        """Test /image/encode handles errors gracefully."""
-        with (
-            patch.object(mock_image_instance, "encode", side_effect=Exception("Encoding failed")),
-            pytest.raises(HTTPException, match=r"Failed to encode image"),
-        ):
-            asyncio.run(mock_image_router.post_encode(mock_request_object))
+ENDPOINT_CASES = [
+    EndpointCase("encode", "encode", "Image encoded successfully", "image_data", str, "Failed to encode image"),
+    EndpointCase("decode", "decode", "Image decoded successfully", "decoded_message", str, "Failed to decode image"),
+    EndpointCase(
+        "capacity",
+        "get_capacity",
+        "Capacity calculated successfully",
+        "capacity_characters",
+        int,
+        "Failed to calculate capacity",
+    ),
+]
 
 
-class TestPostDecodeEndpoint:
-    """Integration and unit tests for the /image/decode endpoint."""
+@pytest.mark.parametrize("case", ENDPOINT_CASES, ids=[case.endpoint for case in ENDPOINT_CASES])
+class TestPostEndpoint:
+    """Integration and unit tests for the /image/encode, /image/decode and /image/capacity endpoints."""
 
     @pytest.fixture
-    def mock_request_object(self, mock_post_decode_request: PostDecodeRequest) -> Request:
-        """Provide a mock Request object with JSON data."""
-        request = MagicMock(spec=Request)
-        request.json = AsyncMock(return_value=mock_post_decode_request.model_dump())
-        return request
-
-    def test_post_decode(self, mock_image_router: ImageRouter, mock_request_object: Request) -> None:
-        """Test the /image/decode method handles valid JSON and returns a model reply."""
-        response = asyncio.run(mock_image_router.post_decode(mock_request_object))
+    def mock_request_object(self, request: pytest.FixtureRequest, case: EndpointCase) -> Request:
+        """Provide a mock Request object with the endpoint's JSON body."""
+        return make_request(request.getfixturevalue(f"mock_post_{case.endpoint}_body"))
+
+    @pytest.fixture(autouse=True)
+    def mock_improps(self, mock_image_instance: Image) -> Generator[MagicMock]:
+        """Mock reading image properties from the request's image bytes."""
+        with patch("python_steganographer.image.iio.improps") as mock:
+            mock.return_value.shape = mock_image_instance.shape
+            yield mock
+
+    def test_post(
+        self,
+        event_runner: asyncio.Runner,
+        mock_image_router: ImageRouter,
+        mock_request_object: Request,
+        case: EndpointCase,
+    ) -> None:
+        """Test the endpoint handles valid JSON and returns a model reply."""
+        response = event_runner.run(getattr(mock_image_router, f"post_{case.endpoint}")(mock_request_object))
+
+        assert response.message == case.expected_message
+        assert isinstance(getattr(response, case.result_field), case.result_type)
+
+    def test_post_error(
+        self,
+        event_runner: asyncio.Runner,
+        mock_image_router: ImageRouter,
+        mock_request_object: Request,
+        mock_image_instance: Image,
+        case: EndpointCase,
+    ) -> None:
+        """Test the endpoint handles errors gracefully."""
+        setattr(mock_image_instance, case.mocked_method, raise_processing_error)
 
-        assert response.message == "Image decoded successfully"
-        assert isinstance(response.decoded_message, str)
+        with pytest.raises(HTTPException, match=case.error_regex):
+            event_runner.run(getattr(mock_image_router, f"post_{case.endpoint}")(mock_request_object))
 
-    def test_post_decode_error(
-        self, mock_image_router: ImageRouter, mock_request_object: Request, mock_image_instance: Image
+    def test_post_invalid_request(
+        self, event_runner: asyncio.Runner, mock_image_router: ImageRouter, case: EndpointCase
     ) -> None:
-        """Test /image/decode handles errors gracefully."""
-        with (
-            patch.object(mock_image_instance, "decode", side_effect=Exception("Decoding failed")),
-            pytest.raises(HTTPException, match=r"Failed to decode image"),
-        ):
-            asyncio.run(mock_image_router.post_decode(mock_request_object))
+        """Test the endpoint rejects bodies that do not match the request model."""
+        request = make_request(b'{"image_data": "", "output_format": "png", "message": "", "algorithm": "x"}')
+
+        with pytest.raises(HTTPException, match=case.error_regex):
+            event_runner.run(getattr(mock_image_router, f"post_{case.endpoint}")(request))
 
 
-class TestPostCapacityEndpoint:
-    """Integration and unit tests for the /image/capacity endpoint."""
+class TestUploadEndpoints:
+    """Unit tests for the image file upload endpoints."""
 
     @pytest.fixture
-    def mock_request_object(self, mock_post_capacity_request: PostCapacityRequest) -> Request:
-        """Provide a mock Request object with JSON data."""
-        request = MagicMock(spec=Request)
-        request.json = AsyncMock(return_value=mock_post_capacity_request.model_dump())
-        return request
+    def mock_upload_file(self, mock_big_image_bytes: bytes) -> UploadFile:
+        """Provide a mock uploaded image file."""
+        upload_file = MagicMock(spec=UploadFile)
+        upload_file.read = AsyncMock(return_value=mock_big_image_bytes)
+        return upload_file
+
+    def test_post_encode_upload(
+        self, event_runner: asyncio.Runner, mock_image_router: ImageRouter, mock_upload_file: UploadFile
+    ) -> None:
+        """Test the /image/encode/upload method returns the encoded image bytes."""
+        response = event_runner.run(
+            mock_image_router.post_encode_upload(
+                make_request(b""), mock_upload_file, "Test message", AlgorithmType.LSB, "png"
+            )
+        )
+
+        assert response.media_type == "image/png"
+        assert isinstance(response.body, bytes)
+
+    def test_post_encode_upload_error(
+        self,
+        event_runner: asyncio.Runner,
+        mock_image_router: ImageRouter,
+        mock_upload_file: UploadFile,
+        mock_image_instance: Image,
+    ) -> None:
+        """Test /image/encode/upload handles errors gracefully."""
+        mock_image_instance.encode = raise_processing_error  # type: ignore[method-assign]
+
+        with pytest.raises(HTTPException, match=r"Failed to encode image"):
+            event_runner.run(
+                mock_image_router.post_encode_upload(
+                    make_request(b""), mock_upload_file, "Test message", AlgorithmType.LSB, "png"
+                )
+            )
+
+    def test_post_decode_upload(
+        self, event_runner: asyncio.Runner, mock_image_router: ImageRouter, mock_upload_file: UploadFile
+    ) -> None:
+        """Test the /image/decode/upload method returns the decoded message."""
+        response = event_runner.run(
+            mock_image_router.post_decode_upload(make_request(b""), mock_upload_file, AlgorithmType.LSB)
+        )
 
-    def test_post_capacity(self, mock_image_router: ImageRouter, mock_request_object: Request) -> None:
-        """Test the /image/capacity method handles valid JSON and returns a model reply."""
-        response = asyncio.run(mock_image_router.post_capacity(mock_request_object))
+        assert response.message == "Image decoded successfully"
+        assert response.decoded_message == "Decoded message"
+
+    def test_post_capacity_upload(
+        self,
+        event_runner: asyncio.Runner,
+        mock_image_router: ImageRouter,
+        mock_upload_file: UploadFile,
+        mock_image_instance: Image,
+    ) -> None:
+        """Test the /image/capacity/upload method returns the capacity."""
+        with patch("python_steganographer.image.iio.improps") as mock_improps:
+            mock_improps.return_value.shape = mock_image_instance.shape
+            response = event_runner.run(
+                mock_image_router.post_capacity_upload(make_request(b""), mock_upload_file, AlgorithmType.LSB)
+            )
 
         assert response.message == "Capacity calculated successfully"
-        assert isinstance(response.capacity_characters, int)
-
-    def test_post_capacity_error(
-        self, mock_image_router: ImageRouter, mock_request_object: Request, mock_image_instance: Image
-    ) -> None:
-        """Test /image/capacity handles errors gracefully."""
-        with (
-            patch.object(mock_image_instance, "get_capacity", side_effect=Exception("Capacity calculation failed")),
-            pytest.raises(HTTPException, match=r"Failed to calculate capacity"),
-        ):
-            asyncio.run(mock_image_router.post_capacity(mock_request_object))
+        assert response.capacity_characters == mock_image_instance.get_capacity()
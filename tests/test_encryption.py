@@ -1,24 +1,40 @@
 """Unit tests for the python_steganographer.encryption module."""
 
 import os
+import threading
 from collections.abc import Generator
 from unittest.mock import MagicMock, patch
 
 import pytest
+from cryptography.exceptions import InvalidTag
 from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.decrepit.ciphers import modes
 from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateKey
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms
 
-from python_steganographer.encryption import EncryptionHandler
+from python_steganographer.encryption import EncryptionHandler, RSAKeyPool
 from python_steganographer.models import EncryptionConfig
 
 MOCK_MSG = b"Test message for encryption"
-mock_private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048, backend=default_backend())
 mock_iv = os.urandom(16)
 mock_aes = os.urandom(32)
 
 
+def encrypt_with_aes_cfb(aes_key: bytes, iv: bytes, msg: bytes) -> bytes:
+    """Encrypt a message using AES in CFB mode, as images encoded before the switch to AES-GCM were."""
+    encryptor = Cipher(algorithms.AES(aes_key), modes.CFB(iv), backend=default_backend()).encryptor()
+    return encryptor.update(msg) + encryptor.finalize()
+
+
+@pytest.fixture(scope="session")
+def mock_private_key() -> RSAPrivateKey:
+    """Generate a single RSA private key shared by all tests."""
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048, backend=default_backend())
+
+
 @pytest.fixture
-def mock_generate_private_key() -> Generator[MagicMock]:
+def mock_generate_private_key(mock_private_key: RSAPrivateKey) -> Generator[MagicMock]:
     """Fixture to mock the generation of RSA private keys."""
     with patch("cryptography.hazmat.primitives.asymmetric.rsa.generate_private_key") as mock:
         mock.return_value = mock_private_key
@@ -50,13 +66,51 @@ def mock_encryption_handler(
 class TestEncryptionHandler:
     """Unit tests for the encryption methods."""
 
-    def test_initialization(self, mock_encryption_handler: EncryptionHandler) -> None:
+    def test_initialization(self, mock_encryption_handler: EncryptionHandler, mock_private_key: RSAPrivateKey) -> None:
         """Test initialization of EncryptionHandler with and without provided keys."""
         assert mock_encryption_handler.private_key == mock_private_key
         assert mock_encryption_handler.public_key == mock_private_key.public_key()
         assert mock_encryption_handler.iv == mock_iv
         assert mock_encryption_handler.aes_key == mock_aes
 
+    def test_private_key_generated_lazily(
+        self,
+        mock_encryption_handler: EncryptionHandler,
+        mock_generate_private_key: MagicMock,
+        mock_private_key: RSAPrivateKey,
+    ) -> None:
+        """Test that the RSA private key is only generated when first accessed."""
+        mock_generate_private_key.assert_not_called()
+        assert mock_encryption_handler.private_key == mock_private_key
+        assert mock_encryption_handler.private_key == mock_private_key
+        mock_generate_private_key.assert_called_once()
+
+    def test_initialization_with_private_key(
+        self, mock_generate_private_key: MagicMock, mock_private_key: RSAPrivateKey
+    ) -> None:
+        """Test that no RSA key is generated when a private key is provided."""
+        encryption_handler = EncryptionHandler(private_key=mock_private_key, iv=mock_iv, aes_key=mock_aes)
+        assert encryption_handler.public_key == mock_private_key.public_key()
+        mock_generate_private_key.assert_not_called()
+
+    def test_generate(
+        self,
+        mock_generate_private_key: MagicMock,
+        mock_os_urandom: MagicMock,
+        mock_private_key: RSAPrivateKey,
+        mock_encryption_config: EncryptionConfig,
+    ) -> None:
+        """Test creating an EncryptionHandler with freshly generated keys."""
+        encryption_handler = EncryptionHandler.generate(
+            private_key_size=mock_encryption_config.private_key_size,
+            iv_size=mock_encryption_config.iv_size,
+            aes_key_size=mock_encryption_config.aes_key_size,
+        )
+        mock_generate_private_key.assert_called_once()
+        assert encryption_handler.private_key == mock_private_key
+        assert encryption_handler.iv == mock_iv
+        assert encryption_handler.aes_key == mock_aes
+
     def test_initialization_missing_parameters(self) -> None:
         """Test that initialization raises ValueError when parameters are missing."""
         with pytest.raises(ValueError, match=r"Either provide the keys or their sizes to generate new keys."):
@@ -85,6 +139,22 @@ class TestEncryptionHandler:
         )
         assert MOCK_MSG == decrypted_msg.encode("utf-8")
 
+    def test_decrypt_with_aes_tampered_message(self, mock_encryption_handler: EncryptionHandler) -> None:
+        """Test that AES decryption rejects a tampered message."""
+        encrypted_msg = EncryptionHandler.encrypt_with_aes(
+            mock_encryption_handler.aes_key, mock_encryption_handler.iv, MOCK_MSG
+        )
+        tampered_msg = bytes([encrypted_msg[0] ^ 1]) + encrypted_msg[1:]
+        with pytest.raises(InvalidTag):
+            EncryptionHandler.decrypt_with_aes(
+                mock_encryption_handler.aes_key, mock_encryption_handler.iv, tampered_msg
+            )
+
+    def test_decrypt_with_aes_cfb(self) -> None:
+        """Test AES-CFB decryption of messages encrypted before the switch to AES-GCM."""
+        encrypted_msg = encrypt_with_aes_cfb(mock_aes, mock_iv, MOCK_MSG)
+        assert EncryptionHandler.decrypt_with_aes_cfb(mock_aes, mock_iv, encrypted_msg) == MOCK_MSG.decode("utf-8")
+
     def test_encrypt_and_decrypt_with_rsa(self, mock_encryption_handler: EncryptionHandler) -> None:
         """Test RSA encryption and decryption."""
         encrypted_msg = EncryptionHandler.encrypt_with_rsa(mock_encryption_handler.public_key, MOCK_MSG)
@@ -96,3 +166,97 @@ class TestEncryptionHandler:
         encrypted_data, _ = mock_encryption_handler.encrypt(MOCK_MSG.decode("utf-8"))
         decrypted_msg = mock_encryption_handler.decrypt(encrypted_data)
         assert MOCK_MSG == decrypted_msg.encode("utf-8")
+
+    def test_decrypt_tampered_message(self, mock_encryption_handler: EncryptionHandler) -> None:
+        """Test that decryption rejects a tampered AES-GCM message instead of falling back to AES-CFB."""
+        encrypted_data, _ = mock_encryption_handler.encrypt(MOCK_MSG.decode("utf-8"))
+        tampered_data = encrypted_data[:-1] + bytes([encrypted_data[-1] ^ 1])
+        with pytest.raises(InvalidTag):
+            mock_encryption_handler.decrypt(tampered_data)
+
+    def test_decrypt_wrong_aes_key(self, mock_encryption_handler: EncryptionHandler) -> None:
+        """Test that decryption with the wrong AES key is rejected."""
+        encrypted_data, _ = mock_encryption_handler.encrypt(MOCK_MSG.decode("utf-8"))
+        mock_encryption_handler.aes_key = bytes(len(mock_aes))
+        with pytest.raises(InvalidTag):
+            mock_encryption_handler.decrypt(encrypted_data)
+
+    def test_decrypt_legacy_aes_cfb(self, mock_private_key: RSAPrivateKey) -> None:
+        """Test that data encrypted with AES-CFB behind a 16 byte IV, without the AES-GCM marker, still decrypts."""
+        encrypted_data = mock_iv + encrypt_with_aes_cfb(mock_aes, mock_iv, MOCK_MSG)
+        encrypted_aes_key = EncryptionHandler.encrypt_with_rsa(mock_private_key.public_key(), mock_aes)
+
+        encryption_handler = EncryptionHandler.from_encrypted(
+            private_key=mock_private_key, encrypted_aes_key=encrypted_aes_key, iv_size=12, msg=encrypted_data
+        )
+        assert encryption_handler.decrypt(encrypted_data) == MOCK_MSG.decode("utf-8")
+
+
+class TestRSAKeyPool:
+    """Unit tests for the RSA key pool."""
+
+    @pytest.fixture
+    def mock_generate_private_key(self) -> Generator[MagicMock]:
+        """Fixture to mock key generation with a distinct key per call."""
+        with patch.object(EncryptionHandler, "generate_private_key", side_effect=lambda _: MagicMock()) as mock:
+            yield mock
+
+    @staticmethod
+    def wait_for_pool(pool: RSAKeyPool) -> None:
+        """Wait for all background key generation scheduled so far to finish."""
+        pool._requests.join()
+
+    def test_fill(self, mock_generate_private_key: MagicMock) -> None:
+        """Test that filling the pool generates keys in the background up to the pool size."""
+        pool = RSAKeyPool(pool_size=2)
+        pool.fill(1024)
+        pool.fill(1024)
+        self.wait_for_pool(pool)
+
+        assert mock_generate_private_key.call_count == 2  # noqa: PLR2004
+        assert pool._get_pool(1024).full()
+
+    def test_fill_counts_pending_keys(self) -> None:
+        """Test that filling the pool again while keys are being generated does not schedule more work."""
+        generation_started = threading.Event()
+        release_generation = threading.Event()
+
+        def generate_private_key(_private_key_size: int) -> MagicMock:
+            generation_started.set()
+            release_generation.wait()
+            return MagicMock()
+
+        pool = RSAKeyPool(pool_size=2)
+        with patch.object(EncryptionHandler, "generate_private_key", side_effect=generate_private_key) as mock:
+            pool.fill(1024)
+            generation_started.wait()
+            pool.fill(1024)
+            pool.fill(1024)
+
+            assert pool._requests.unfinished_tasks == 2  # noqa: PLR2004
+            release_generation.set()
+            self.wait_for_pool(pool)
+
+        assert mock.call_count == 2  # noqa: PLR2004
+        assert pool._worker is not None
+        assert pool._worker.daemon
+
+    def test_get_hands_out_each_key_once(self, mock_generate_private_key: MagicMock) -> None:
+        """Test that pooled keys are handed out once and replaced, bucketed by key size."""
+        pool = RSAKeyPool(pool_size=2)
+        pool.fill(1024)
+        self.wait_for_pool(pool)
+
+        keys = [pool.get(1024) for _ in range(4)]
+        self.wait_for_pool(pool)
+
+        assert len({id(key) for key in keys}) == len(keys)
+        assert pool._get_pool(1024).full()
+        assert pool._get_pool(2048).empty()
+
+    def test_get_empty_pool(self, mock_generate_private_key: MagicMock) -> None:
+        """Test that a key is generated on demand when the pool is empty."""
+        pool = RSAKeyPool(pool_size=1)
+
+        assert pool.get(2048) is not None
+        mock_generate_private_key.assert_any_call(2048)
@@ -1,10 +1,15 @@
 """Unit tests for the python_steganographer.helpers module."""
 
+import numpy as np
+import pytest
+
 from python_steganographer.helpers import (
+    bit_chunks_to_msg,
     byte_list_to_char,
     bytes_list_to_msg,
+    bytes_to_ascii,
     bytes_to_str,
-    char_to_byte_list,
+    msg_to_ascii,
     msg_to_bytes_list,
     str_to_bytes,
 )
@@ -16,14 +21,29 @@ def test_bytes_to_str_and_str_to_bytes() -> None:
     encoded_str = bytes_to_str(original_bytes)
     decoded_bytes = str_to_bytes(encoded_str)
     assert original_bytes == decoded_bytes
+    assert str_to_bytes(encoded_str.rstrip("=")) == original_bytes
+    assert bytes_to_ascii(original_bytes) == encoded_str.encode("ascii")
+
+
+def test_byte_list_to_char() -> None:
+    """Test conversion from a byte list to a character."""
+    assert byte_list_to_char([1, 1, 1, 1, 0, 1, 0]) == "z"
+    assert byte_list_to_char([1, 0, 0, 0, 0, 1]) == "!"
+    assert byte_list_to_char([1, 1, 0, 0, 0, 0, 1, 1]) == "a"
+
+
+def test_msg_to_bytes_list() -> None:
+    """Test conversion from a message to its bit representation."""
+    byte_list = msg_to_bytes_list("az")
+    assert byte_list.dtype == np.uint8
+    assert byte_list.tolist() == [1, 1, 0, 0, 0, 0, 1, 1, 1, 1, 1, 0, 1, 0]
+    np.testing.assert_array_equal(msg_to_bytes_list(b"az"), byte_list)
 
 
-def test_char_to_byte_list_and_byte_list_to_char() -> None:
-    """Test conversion between a character and its byte list representation."""
-    original_char = "z"
-    byte_list = char_to_byte_list(original_char)
-    restored_char = byte_list_to_char(byte_list)
-    assert original_char == restored_char
+def test_msg_to_ascii() -> None:
+    """Test that messages are converted to ASCII bytes."""
+    assert msg_to_ascii("az") == b"az"
+    assert msg_to_ascii(b"az") == b"az"
 
 
 def test_msg_to_bytes_list_and_bytes_list_to_msg() -> None:
@@ -32,3 +52,25 @@ def test_msg_to_bytes_list_and_bytes_list_to_msg() -> None:
     byte_list = msg_to_bytes_list(original_msg)
     restored_msg = bytes_list_to_msg(byte_list)
     assert original_msg == restored_msg
+
+
+@pytest.mark.parametrize(
+    ("trailing_bits", "expected"),
+    [
+        ([1, 1, 0], "hi\x06"),
+        ([1, 0, 0, 0, 0, 1], "hi!"),
+        ([0, 0], "hi"),
+    ],
+)
+def test_bytes_list_to_msg_partial_character(trailing_bits: list[int], expected: str) -> None:
+    """Test that trailing bits which do not fill a character are decoded as a zero-padded last character."""
+    bits = [*msg_to_bytes_list("hi").tolist(), *trailing_bits]
+    assert bytes_list_to_msg(bits) == expected
+    assert bytes_list_to_msg(np.array(bits, dtype=np.uint8)) == expected
+
+
+def test_bit_chunks_to_msg_stops_at_null() -> None:
+    """Test that chunked conversion stops consuming chunks after the null character."""
+    chunks = iter([msg_to_bytes_list("hel"), msg_to_bytes_list("lo\0x"), msg_to_bytes_list("ignored")])
+    assert bit_chunks_to_msg(chunks) == "hello"
+    assert next(chunks).size == len("ignored") * 7
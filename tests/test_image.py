@@ -1,40 +1,190 @@
 """Unit tests for the python_steganographer.image module."""
 
+import io
+import os
+from unittest.mock import patch
+
+import imageio.v3 as iio
+import numpy as np
+import pytest
+from cryptography.hazmat.decrepit.ciphers import modes
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms
+from numpy.typing import NDArray
+from PIL import Image as PILImage
+
+from python_steganographer.encryption import EncryptionHandler
+from python_steganographer.helpers import bytes_to_str
 from python_steganographer.image import Image
 from python_steganographer.models import EncryptionConfig
 
 MOCK_MSG = "Test"
 
 
+@pytest.fixture(params=["lsb", "dct"])
+def image_instance(request: pytest.FixtureRequest) -> Image:
+    """Provide an Image instance for each algorithm, so tests run once per algorithm."""
+    return request.getfixturevalue(f"mock_image_instance_{request.param}")  # type: ignore[no-any-return]
+
+
 class TestImage:
     """Unit tests for the Image class."""
 
-    def test_encode_and_decode_channel(self, mock_image_instance_lsb: Image, mock_image_instance_dct: Image) -> None:
+    @pytest.mark.parametrize("format_str", ["png", ".png", "bmp", "tiff"])
+    def test_save_and_load_image(self, mock_image: NDArray[np.uint8], format_str: str) -> None:
+        """Test that an image survives a round trip through lossless image bytes."""
+        image_instance = Image.lsb()
+        image_instance.array = mock_image
+
+        image_bytes = image_instance.save_image_to_bytes(format_str)
+        image_instance.load_image(image_bytes)
+
+        np.testing.assert_array_equal(image_instance.array, mock_image)
+
+    @pytest.mark.parametrize(
+        ("format_str", "expected"),
+        [
+            ("png", "image/png"),
+            (".png", "image/png"),
+            ("jpg", "image/jpeg"),
+            ("JPEG", "image/jpeg"),
+            ("tiff", "image/tiff"),
+            ("unknown", "application/octet-stream"),
+        ],
+    )
+    def test_get_media_type(self, format_str: str, expected: str) -> None:
+        """Test that image formats map to their registered media types."""
+        assert Image.get_media_type(format_str) == expected
+
+    def test_load_image_contiguous_uint8(self, mock_image: NDArray[np.uint8]) -> None:
+        """Test that loaded images are stored as C-contiguous uint8 arrays."""
+        image_instance = Image.lsb()
+
+        with patch("python_steganographer.image.iio.imread", return_value=np.asfortranarray(mock_image)):
+            image_instance.load_image(b"")
+
+        assert image_instance.array.flags.c_contiguous
+        assert image_instance.array.dtype == np.uint8
+        np.testing.assert_array_equal(image_instance.array, mock_image)
+
+    def test_warm_up(self) -> None:
+        """Test that warming up round trips an image through the codecs once per process."""
+        Image.warm_up.cache_clear()
+        with patch("python_steganographer.image.iio.imread", wraps=iio.imread) as mock_imread:
+            Image.warm_up()
+            Image.warm_up()
+
+        mock_imread.assert_called_once()
+
+    def test_load_array(self, mock_image: NDArray[np.uint8]) -> None:
+        """Test that decoded arrays are loaded without copying when already C-contiguous uint8."""
+        image_instance = Image.lsb()
+        array = mock_image.copy()
+
+        image_instance.load_array(array)
+        assert image_instance.array is array
+        assert image_instance.shape == mock_image.shape
+
+        image_instance.load_array(np.asfortranarray(mock_image))
+        assert image_instance.array.flags.c_contiguous
+        np.testing.assert_array_equal(image_instance.array, mock_image)
+
+    def test_load_image_properties(self, mock_image: NDArray[np.uint8]) -> None:
+        """Test that the image shape and capacity are available without decoding the pixels."""
+        image_instance = Image.lsb()
+        image_instance.array = mock_image
+        image_bytes = image_instance.save_image_to_bytes("png")
+
+        image_instance = Image.lsb()
+        image_instance.load_image_properties(image_bytes)
+
+        assert image_instance.shape == mock_image.shape
+        assert image_instance.array.size == 0
+        assert image_instance.get_capacity() == image_instance.algorithm.calculate_capacity(mock_image.shape[:2])
+
+    @pytest.mark.parametrize(
+        ("mode", "expected_shape"),
+        [("L", (4, 5)), ("I;16", (4, 5)), ("LA", (4, 5, 2)), ("RGB", (4, 5, 3)), ("RGBA", (4, 5, 4)), ("P", None)],
+    )
+    def test_read_png_shape(self, mode: str, expected_shape: tuple[int, ...] | None) -> None:
+        """Test that PNG shapes are read from the header, except for palette images."""
+        buffer = io.BytesIO()
+        PILImage.new(mode, (5, 4)).save(buffer, format="PNG")
+
+        assert Image.read_png_shape(buffer.getvalue()) == expected_shape
+
+    @pytest.mark.parametrize("format_str", ["bmp", "tiff"])
+    def test_read_png_shape_other_formats(self, mock_image: NDArray[np.uint8], format_str: str) -> None:
+        """Test that the shapes of other formats are not read from the header."""
+        image_instance = Image.lsb()
+        image_instance.array = mock_image
+        image_bytes = image_instance.save_image_to_bytes(format_str)
+
+        assert Image.read_png_shape(image_bytes) is None
+
+        image_instance.load_image_properties(image_bytes)
+        assert image_instance.shape == mock_image.shape
+
+    def test_load_image_properties_truncated_png(self, mock_image: NDArray[np.uint8]) -> None:
+        """Test that image properties come from the PNG header alone, while loading the truncated image fails."""
+        image_instance = Image.lsb()
+        image_instance.array = mock_image
+        truncated_bytes = image_instance.save_image_to_bytes("png")[:100]
+
+        image_instance.load_image_properties(truncated_bytes)
+        assert image_instance.shape == mock_image.shape
+
+        with pytest.raises(OSError):  # noqa: PT011
+            image_instance.load_image(truncated_bytes)
+
+    def test_load_image_invalid_shape(self, mock_image_channel: NDArray[np.uint8]) -> None:
+        """Test that images without a channel axis are rejected."""
+        image_instance = Image.lsb()
+
+        with (
+            patch("python_steganographer.image.iio.imread", return_value=mock_image_channel),
+            pytest.raises(ValueError, match=r"Image must have shape \(height, width, channels\)"),
+        ):
+            image_instance.load_image(b"")
+
+    @pytest.mark.parametrize("channel", [0, 1, 2])
+    def test_encode_and_decode_channel(self, image_instance: Image, channel: int) -> None:
         """Test encoding and decoding a message in an image channel."""
-        for image_instance in [mock_image_instance_lsb, mock_image_instance_dct]:
-            for channel in [0, 1, 2]:
-                image_instance.encode_channel(channel=channel, msg=MOCK_MSG)
-                assert image_instance.decode_channel(channel=channel) == MOCK_MSG
-
-    def test_encode_and_decode(
-        self,
-        mock_image_instance_lsb: Image,
-        mock_image_instance_dct: Image,
-        mock_encryption_config: EncryptionConfig,
-    ) -> None:
+        image_instance.encode_channel(channel=channel, msg=MOCK_MSG)
+        assert image_instance.decode_channel(channel=channel) == MOCK_MSG
+
+    def test_encode_and_decode(self, image_instance: Image, mock_encryption_config: EncryptionConfig) -> None:
         """Test encoding and decoding a message in an image."""
-        for image_instance in [mock_image_instance_lsb, mock_image_instance_dct]:
-            image_instance.encode(
-                msg=MOCK_MSG,
-                private_key_size=mock_encryption_config.private_key_size,
-                iv_size=mock_encryption_config.iv_size,
-                aes_key_size=mock_encryption_config.aes_key_size,
-            )
-            assert image_instance.decode(iv_size=mock_encryption_config.iv_size) == MOCK_MSG
-
-    def test_get_capacity(self, mock_image_instance_lsb: Image, mock_image_instance_dct: Image) -> None:
+        image_instance.encode(
+            msg=MOCK_MSG,
+            private_key_size=mock_encryption_config.private_key_size,
+            iv_size=mock_encryption_config.iv_size,
+            aes_key_size=mock_encryption_config.aes_key_size,
+        )
+        assert image_instance.decode(iv_size=mock_encryption_config.iv_size) == MOCK_MSG
+
+    def test_decode_legacy_aes_cfb(self, image_instance: Image, mock_encryption_config: EncryptionConfig) -> None:
+        """Test decoding an image encoded before the switch from AES-CFB to AES-GCM.
+
+        The channels are written the way the original encoder wrote them: AES-CFB with a 16 byte IV.
+        """
+        private_key = EncryptionHandler.generate_private_key(mock_encryption_config.private_key_size)
+        iv = os.urandom(16)
+        aes_key = os.urandom(mock_encryption_config.aes_key_size)
+        encryptor = Cipher(algorithms.AES(aes_key), modes.CFB(iv)).encryptor()
+        encrypted_data = iv + encryptor.update(MOCK_MSG.encode("utf-8")) + encryptor.finalize()
+
+        image_instance.encode_channel(0, bytes_to_str(encrypted_data))
+        image_instance.encode_channel(
+            1, bytes_to_str(EncryptionHandler.encrypt_with_rsa(private_key.public_key(), aes_key))
+        )
+        image_instance.encode_channel(
+            2, EncryptionHandler.strip_pem_headers(EncryptionHandler.private_key_to_str(private_key))
+        )
+
+        assert image_instance.decode(iv_size=12) == MOCK_MSG
+
+    def test_get_capacity(self, image_instance: Image) -> None:
         """Test calculating the steganography capacity of an image."""
-        for image_instance in [mock_image_instance_lsb, mock_image_instance_dct]:
-            capacity = image_instance.get_capacity()
-            assert isinstance(capacity, int)
-            assert capacity > 0
+        capacity = image_instance.get_capacity()
+        assert isinstance(capacity, int)
+        assert capacity > 0
@@ -1,6 +1,17 @@
 """Unit tests for the python_steganographer.models module."""
 
-from python_steganographer.models import EncryptionConfig, ImageConfig, SteganographerServerConfig
+import base64
+import json
+
+import pytest
+
+from python_steganographer.models import (
+    AlgorithmType,
+    EncryptionConfig,
+    ImageConfig,
+    PostEncodeRequest,
+    SteganographerServerConfig,
+)
 
 
 # Steganographer Server Configuration Models
@@ -17,3 +28,37 @@ class TestSteganographerServerConfig:
         config_dict = mock_steganographer_server_config.model_dump()
         assert config_dict["image"] == mock_image_config.model_dump()
         assert config_dict["encryption"] == mock_encryption_config.model_dump()
+
+
+# API Request Models
+class TestPostEncodeRequest:
+    """Unit tests for the PostEncodeRequest class."""
+
+    @pytest.mark.parametrize(
+        "encoder",
+        [
+            base64.b64encode,
+            base64.encodebytes,
+            lambda data: base64.encodebytes(data + b"\x00"),
+        ],
+    )
+    def test_model_validate_json_decodes_image_data(self, encoder: object, mock_big_image_bytes: bytes) -> None:
+        """Test that padded and line-wrapped base64 image data in a JSON body is decoded to bytes."""
+        image_bytes = encoder(mock_big_image_bytes)  # type: ignore[operator]
+        body = json.dumps(
+            {"image_data": image_bytes.decode("ascii"), "output_format": "png", "message": "", "algorithm": "lsb"}
+        )
+
+        encode_request = PostEncodeRequest.model_validate_json(body)
+        assert encode_request.image_data == base64.b64decode(image_bytes)
+        assert encode_request.algorithm == AlgorithmType.LSB
+
+    def test_model_dump_json_round_trip(self, mock_post_encode_request: PostEncodeRequest) -> None:
+        """Test that the request model survives a JSON round trip with standard base64 image data."""
+        body = mock_post_encode_request.model_dump_json()
+        assert json.loads(body)["image_data"] == base64.b64encode(mock_post_encode_request.image_data).decode("ascii")
+        assert PostEncodeRequest.model_validate_json(body) == mock_post_encode_request
+
+    def test_json_schema(self) -> None:
+        """Test that the JSON schema advertises standard base64 image data."""
+        assert PostEncodeRequest.model_json_schema()["properties"]["image_data"]["format"] == "base64"
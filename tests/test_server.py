@@ -1,7 +1,6 @@
 """Unit tests for the python_steganographer.server module."""
 
 from collections.abc import Generator
-from importlib.metadata import PackageMetadata
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -11,32 +10,27 @@ from python_steganographer.routers import ImageRouter
 from python_steganographer.server import SteganographerServer
 
 
-@pytest.fixture(autouse=True)
+@pytest.fixture(autouse=True, scope="module")
 def mock_package_metadata() -> Generator[MagicMock]:
-    """Mock importlib.metadata.metadata to return a mock PackageMetadata."""
+    """Mock importlib.metadata.metadata to return the package metadata as a plain mapping."""
     with patch("python_template_server.template_server.metadata") as mock_metadata:
-        mock_pkg_metadata = MagicMock(spec=PackageMetadata)
-        metadata_dict = {
+        mock_metadata.return_value = {
             "Name": "python-steganographer",
             "Version": "0.1.0",
             "Summary": "A FastAPI application for steganography.",
         }
-        mock_pkg_metadata.__getitem__.side_effect = lambda key: metadata_dict[key]
-        mock_metadata.return_value = mock_pkg_metadata
         yield mock_metadata
 
 
-@pytest.fixture
-def mock_server(
-    mock_steganographer_server_config: SteganographerServerConfig, mock_image_router: ImageRouter
-) -> Generator[SteganographerServer]:
-    """Provide a SteganographerServer instance for testing."""
-    with (
-        patch("python_steganographer.server.ImageRouter", return_value=mock_image_router, autospec=True),
-        patch("python_steganographer.server.SteganographerServerConfig.save_to_file"),
-    ):
-        server = SteganographerServer(config=mock_steganographer_server_config)
-        yield server
+@pytest.fixture(scope="module")
+def mock_server(mock_steganographer_server_config: SteganographerServerConfig) -> Generator[SteganographerServer]:
+    """Provide a SteganographerServer instance shared by the tests in this module.
+
+    The server's routers property returns the module-level IMAGE_ROUTER, which `mock_image_router` configures.
+    """
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(SteganographerServerConfig, "save_to_file", lambda *_args, **_kwargs: None)
+        yield SteganographerServer(config=mock_steganographer_server_config)
 
 
 class TestSteganographerServer: